@@ -0,0 +1,106 @@
+import json
+from bisect import bisect_left
+
+from onbellek import atomic_write
+
+# =============================================================================
+# İLÇE ARAMA İNDEKSİ
+# Konum hiyerarşisindeki her ilçe (ilçe + şehir + ülke adı) kelimelerine ayrılır,
+# kelimeler Türkçe harf ve büyük/küçük harf farkı gözetmeden sadeleştirilir ve
+# sıralı bir listede tutulur. Önek araması bisect ile yapılır (yazarken anlık).
+# =============================================================================
+
+INDEX_VERSION = 1
+
+# Türkçe büyük/küçük harf ve şapkalı harfler: "İzmir", "IZMIR", "izmır" -> "izmir"
+_FOLD = str.maketrans({
+    "I": "i", "İ": "i", "ı": "i", "Ş": "s", "ş": "s", "Ğ": "g", "ğ": "g",
+    "Ü": "u", "ü": "u", "Ö": "o", "ö": "o", "Ç": "c", "ç": "c",
+    "Â": "a", "â": "a", "Î": "i", "î": "i", "Û": "u", "û": "u",
+})
+
+
+def fold(text):
+    """Aramada karşılaştırılacak sade biçim: küçük harf, Türkçe karakterler ASCII karşılığına."""
+    text = (text or "").translate(_FOLD).lower()
+    return "".join(ch if ch.isalnum() else " " for ch in text)
+
+
+def tokens(text):
+    return fold(text).split()
+
+
+class DistrictIndex:
+    """Ilçe adlarında önek araması. entries: [(ilçe id, ilçe, şehir, ülke), ...]"""
+
+    def __init__(self, entries, signature=None):
+        self.entries = [tuple(e) for e in entries]
+        self.signature = signature  # Kaynak listelerin durumu (değişince yeniden kurulur)
+        keys = set()
+        for i, (_, district, city, country) in enumerate(self.entries):
+            for token in tokens(f"{district} {city} {country}"):
+                keys.add((token, i))
+        keys = sorted(keys)
+        self.keys = [k for k, _ in keys]
+        self.refs = [i for _, i in keys]
+        self._prepare()
+
+    def _prepare(self):
+        # Sıralama anahtarı için sadeleştirilmiş ilçe adı ve il merkezi mi bilgisi (arama başına fold yok)
+        self._names = [" ".join(tokens(e[1])) for e in self.entries]
+        self._centers = [fold(e[1]) == fold(e[2]) for e in self.entries]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _prefix_matches(self, prefix):
+        """Kelimelerinden biri prefix ile başlayan kayıtların indeksleri."""
+        lo = bisect_left(self.keys, prefix)
+        hi = bisect_left(self.keys, prefix + "￿", lo)
+        return set(self.refs[lo:hi])
+
+    def search(self, query, limit=20):
+        """
+        Sorgunun her kelimesi, kaydın (ilçe / şehir / ülke) bir kelimesinin öneki olmalı.
+        Adı sorguyla başlayan ilçeler önce gelir. [(ilçe id, ilçe, şehir, ülke), ...] döner.
+        """
+        words = tokens(query)
+        if not words:
+            return []
+        matches = None
+        for word in sorted(words, key=len, reverse=True):  # En seçici kelime önce
+            found = self._prefix_matches(word)
+            matches = found if matches is None else matches & found
+            if not matches:
+                return []
+
+        folded_query = " ".join(words)
+        def rank(i):
+            name = self._names[i]
+            return (not name.startswith(folded_query), not self._centers[i], len(name), name)
+
+        return [self.entries[i] for i in sorted(matches, key=rank)[:limit]]
+
+    # --- KALICILIK ---
+    def save(self, path):
+        data = {"version": INDEX_VERSION, "signature": self.signature, "entries": self.entries,
+                "keys": self.keys, "refs": self.refs}
+        atomic_write(path, json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+    @classmethod
+    def load(cls, path):
+        """Kayıtlı indeks; dosya yoksa / bozuksa / sürümü eskiyse None."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION:
+                return None
+            index = cls.__new__(cls)
+            index.entries = [tuple(e) for e in data["entries"]]
+            index.signature = data["signature"]
+            index.keys = data["keys"]
+            index.refs = data["refs"]
+            index._prepare()
+            return index
+        except:
+            return None
@@ -0,0 +1,242 @@
+import math
+
+# =============================================================================
+# ÇEVRİMDIŞI VAKİT HESABI
+# API'ye ulaşılamadığında ve cache boşken vakitler koordinattan hesaplanır.
+# Güneş konumu: Meeus / NOAA'nın düşük hassasiyetli formülleri (dakika altı hata).
+# Diyanet yöntemi: İmsak 18°, Yatsı 17°, İkindi gölge = 1 boy (Şafii/asr-ı evvel)
+# ve temkin (ihtiyat) süreleri.
+# =============================================================================
+
+IMSAK_ACISI = 18.0
+YATSI_ACISI = 17.0
+DOGUS_BATIS_ACISI = 0.833  # Kırılma (34') + güneş yarıçapı (16')
+IKINDI_GOLGE = 1
+
+# Dakika cinsinden ihtiyat payları (Diyanet, 1983 ve 2011 düzenlemeleri)
+TEMKIN = {"Imsak": 0, "Gunes": -7, "Ogle": 5, "Ikindi": 4, "Aksam": 7, "Yatsi": 0}
+
+VAKIT_ANAHTARLARI = ["Imsak", "Gunes", "Ogle", "Ikindi", "Aksam", "Yatsi"]
+
+HICRI_AYLAR = ["Muharrem", "Safer", "Rebiülevvel", "Rebiülahir", "Cemaziyelevvel", "Cemaziyelahir",
+               "Recep", "Şaban", "Ramazan", "Şevval", "Zilkade", "Zilhicce"]
+
+# İl merkezleri: (enlem, boylam). Diyanet'in il adlarıyla (büyük harf) eşleşir.
+IL_KOORDINATLARI = {
+    "ADANA": (37.0000, 35.3213), "ADIYAMAN": (37.7648, 38.2786), "AFYONKARAHİSAR": (38.7507, 30.5567),
+    "AĞRI": (39.7191, 43.0503), "AKSARAY": (38.3687, 34.0370), "AMASYA": (40.6499, 35.8353),
+    "ANKARA": (39.9334, 32.8597), "ANTALYA": (36.8969, 30.7133), "ARDAHAN": (41.1105, 42.7022),
+    "ARTVİN": (41.1828, 41.8183), "AYDIN": (37.8560, 27.8416), "BALIKESİR": (39.6484, 27.8826),
+    "BARTIN": (41.6344, 32.3375), "BATMAN": (37.8812, 41.1351), "BAYBURT": (40.2552, 40.2249),
+    "BİLECİK": (40.0567, 30.0665), "BİNGÖL": (38.8847, 40.4939), "BİTLİS": (38.4006, 42.1095),
+    "BOLU": (40.7395, 31.6116), "BURDUR": (37.7203, 30.2908), "BURSA": (40.1826, 29.0665),
+    "ÇANAKKALE": (40.1553, 26.4142), "ÇANKIRI": (40.6013, 33.6134), "ÇORUM": (40.5506, 34.9556),
+    "DENİZLİ": (37.7765, 29.0864), "DİYARBAKIR": (37.9144, 40.2306), "DÜZCE": (40.8438, 31.1565),
+    "EDİRNE": (41.6818, 26.5623), "ELAZIĞ": (38.6810, 39.2264), "ERZİNCAN": (39.7500, 39.5000),
+    "ERZURUM": (39.9000, 41.2700), "ESKİŞEHİR": (39.7767, 30.5206), "GAZİANTEP": (37.0662, 37.3833),
+    "GİRESUN": (40.9128, 38.3895), "GÜMÜŞHANE": (40.4386, 39.5086), "HAKKARİ": (37.5833, 43.7333),
+    "HATAY": (36.2021, 36.1600), "IĞDIR": (39.9237, 44.0450), "ISPARTA": (37.7648, 30.5566),
+    "İSTANBUL": (41.0082, 28.9784), "İZMİR": (38.4237, 27.1428), "KAHRAMANMARAŞ": (37.5858, 36.9371),
+    "KARABÜK": (41.2061, 32.6204), "KARAMAN": (37.1759, 33.2287), "KARS": (40.6167, 43.1000),
+    "KASTAMONU": (41.3887, 33.7827), "KAYSERİ": (38.7312, 35.4787), "KIRIKKALE": (39.8468, 33.5153),
+    "KIRKLARELİ": (41.7333, 27.2167), "KIRŞEHİR": (39.1425, 34.1709), "KİLİS": (36.7184, 37.1212),
+    "KOCAELİ": (40.8533, 29.8815), "KONYA": (37.8667, 32.4833), "KÜTAHYA": (39.4167, 29.9833),
+    "MALATYA": (38.3552, 38.3095), "MANİSA": (38.6191, 27.4289), "MARDİN": (37.3212, 40.7245),
+    "MERSİN": (36.8000, 34.6333), "MUĞLA": (37.2153, 28.3636), "MUŞ": (38.9462, 41.7539),
+    "NEVŞEHİR": (38.6939, 34.6857), "NİĞDE": (37.9667, 34.6833), "ORDU": (40.9839, 37.8764),
+    "OSMANİYE": (37.0742, 36.2478), "RİZE": (41.0201, 40.5234), "SAKARYA": (40.6940, 30.4358),
+    "SAMSUN": (41.2928, 36.3313), "SİİRT": (37.9333, 41.9500), "SİNOP": (42.0231, 35.1531),
+    "SİVAS": (39.7477, 37.0179), "ŞANLIURFA": (37.1591, 38.7969), "ŞIRNAK": (37.4187, 42.4918),
+    "TEKİRDAĞ": (40.9833, 27.5167), "TOKAT": (40.3167, 36.5500), "TRABZON": (41.0015, 39.7178),
+    "TUNCELİ": (39.1079, 39.5401), "UŞAK": (38.6823, 29.4082), "VAN": (38.4891, 43.4089),
+    "YALOVA": (40.6500, 29.2667), "YOZGAT": (39.8181, 34.8147), "ZONGULDAK": (41.4564, 31.7987),
+}
+
+
+def tr_upper(text):
+    """Türkçe kurallarına göre büyük harf ('i' -> 'İ', 'ı' -> 'I')."""
+    return text.replace("i", "İ").replace("ı", "I").upper()
+
+
+def city_coordinates(city_name):
+    """Diyanet il adından (örn. 'İSTANBUL', 'Afyon') il merkezi koordinatı. Bilinmiyorsa None."""
+    if not city_name:
+        return None
+    key = tr_upper(city_name.strip())
+    if key in IL_KOORDINATLARI:
+        return IL_KOORDINATLARI[key]
+    # Diyanet bazı illeri kısaltır / farklı yazar (AFYON, K.MARAŞ, İÇEL)
+    aliases = {"AFYON": "AFYONKARAHİSAR", "K.MARAŞ": "KAHRAMANMARAŞ", "İÇEL": "MERSİN", "URFA": "ŞANLIURFA"}
+    return IL_KOORDINATLARI.get(aliases.get(key, ""))
+
+
+# --- GÜNEŞ KONUMU ---
+def _julian_day(date):
+    return date.toordinal() + 1721424.5  # 0h UT
+
+
+def sun_position(jd):
+    """(deklinasyon derece, zaman denklemi saat) - verilen Jülyen gününde."""
+    d = jd - 2451545.0
+    g = math.radians((357.529 + 0.98560028 * d) % 360)
+    q = (280.459 + 0.98564736 * d) % 360
+    lam = math.radians(q + 1.915 * math.sin(g) + 0.020 * math.sin(2 * g))
+    eps = math.radians(23.439 - 0.00000036 * d)
+    ra = math.degrees(math.atan2(math.cos(eps) * math.sin(lam), math.cos(lam))) / 15.0
+    decl = math.degrees(math.asin(math.sin(eps) * math.sin(lam)))
+    eqt = q / 15.0 - (ra % 24)
+    eqt = (eqt + 12) % 24 - 12
+    return decl, eqt
+
+
+def _hour_angle(altitude, lat, decl):
+    """Güneşin verilen yüksekliğe (derece) ulaştığı saat açısı (saat). Ulaşmıyorsa None."""
+    phi, delta = math.radians(lat), math.radians(decl)
+    cos_h = ((math.sin(math.radians(altitude)) - math.sin(phi) * math.sin(delta))
+             / (math.cos(phi) * math.cos(delta)))
+    if not -1.0 <= cos_h <= 1.0:
+        return None  # Yüksek enlemlerde yaz aylarında tan ağarmaz / batmaz
+    return math.degrees(math.acos(cos_h)) / 15.0
+
+
+def _asr_altitude(lat, decl):
+    return math.degrees(math.atan(1.0 / (IKINDI_GOLGE + math.tan(math.radians(abs(lat - decl))))))
+
+
+def solar_times(date, lat, lon, tz_hours):
+    """
+    Temkinsiz ham vakitler: {anahtar: yerel saat (ondalık saat) veya None}.
+    Her vakit için güneş konumu o vaktin yaklaşık anında yeniden hesaplanır.
+    """
+    jd0 = _julian_day(date) - tz_hours / 24.0
+
+    def transit(hours):
+        _, eqt = sun_position(jd0 + hours / 24.0)
+        return 12 + tz_hours - lon / 15.0 - eqt
+
+    def event(guess, altitude_fn, sign):
+        t = guess
+        for _ in range(3):
+            decl, eqt = sun_position(jd0 + t / 24.0)
+            noon = 12 + tz_hours - lon / 15.0 - eqt
+            ha = _hour_angle(altitude_fn(decl), lat, decl)
+            if ha is None:
+                return None
+            t = noon + sign * ha
+        return t
+
+    noon = transit(12)
+    noon = transit(noon)
+    return {
+        "Imsak": event(noon - 6, lambda decl: -IMSAK_ACISI, -1),
+        "Gunes": event(noon - 6, lambda decl: -DOGUS_BATIS_ACISI, -1),
+        "Ogle": noon,
+        "Ikindi": event(noon + 3, lambda decl: _asr_altitude(lat, decl), 1),
+        "Aksam": event(noon + 6, lambda decl: -DOGUS_BATIS_ACISI, 1),
+        "Yatsi": event(noon + 6, lambda decl: -YATSI_ACISI, 1),
+    }
+
+
+def _format_hhmm(hours):
+    minutes = int(math.floor(hours * 60 + 0.5)) % (24 * 60)
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+# --- HİCRİ TAKVİM (Tabular, yaklaşık) ---
+def hijri_date(date):
+    """Aritmetik (tabular) hicri tarih: (gün, ay, yıl). Diyanet takviminden ±1 gün sapabilir."""
+    jd = date.toordinal() + 1721425  # Öğlen Jülyen gün sayısı
+    days = jd - 1948440 + 10632
+    n = (days - 1) // 10631
+    days = days - 10631 * n + 354
+    j = ((10985 - days) // 5316) * ((50 * days) // 17719) + (days // 5670) * ((43 * days) // 15238)
+    days = days - ((30 - j) // 15) * ((17719 * j) // 50) - (j // 16) * ((15238 * j) // 43) + 29
+    month = (24 * days) // 709
+    day = days - (709 * month) // 24
+    year = 30 * n + j - 30
+    return day, month, year
+
+
+# --- API FORMATINDA GÜN ---
+def compute_day(date, lat, lon, tz_hours=3.0):
+    """
+    Emushaf /vakitler kaydıyla aynı anahtarlara sahip hesaplanmış gün kaydı
+    (vakit.PrayerDay.from_api doğrudan kullanabilir). Hesaplanamayan
+    vakit (yüksek enlem) varsa None döner.
+    """
+    raw = solar_times(date, lat, lon, tz_hours)
+    if any(v is None for v in raw.values()):
+        return None
+    h_day, h_month, h_year = hijri_date(date)
+    item = {key: _format_hhmm(raw[key] + TEMKIN[key] / 60.0) for key in VAKIT_ANAHTARLARI}
+    item.update({
+        "MiladiTarihKisa": date.strftime("%d.%m.%Y"),
+        "HicriTarihKisa": f"{h_day}.{h_month}.{h_year}",
+        "HicriTarihUzun": f"{h_day} {HICRI_AYLAR[h_month - 1]} {h_year}",
+        "GreenwichOrtalamaZamani": tz_hours,
+        "Hesaplanan": True,
+    })
+    return item
+
+
+# --- TOPLU HESAP (NumPy, isteğe bağlı) ---
+def batch_minutes(lats, lons, start, days=365, tz_hours=3.0):
+    """
+    Çok sayıda konum x gün için vakitleri tek seferde hesaplar (NumPy gerekir).
+    lats / lons: konum dizileri, tz_hours: sabit veya konum başına dizi.
+    Dönüş: (konum, gün, vakit) şekilli int16 dizi; gece yarısından itibaren dakika,
+    temkin dahil, VAKIT_ANAHTARLARI sırasıyla. Hesaplanamayan vakitler -1.
+    compute_day ile aynı formül ve yuvarlamayı kullanır.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        raise ImportError("Toplu hesap için NumPy gerekli: pip install numpy")
+
+    lat = np.asarray(lats, dtype=np.float64).reshape(-1, 1)
+    lon = np.asarray(lons, dtype=np.float64).reshape(-1, 1)
+    tz = np.broadcast_to(np.asarray(tz_hours, dtype=np.float64).reshape(-1, 1), lat.shape)
+    # Konumun yerel gece yarısı (UT) Jülyen günü: (konum, gün)
+    jd0 = (_julian_day(start) + np.arange(days, dtype=np.float64)).reshape(1, -1) - tz / 24.0
+    phi = np.radians(lat)
+
+    def position(t):
+        d = jd0 + t / 24.0 - 2451545.0
+        g = np.radians((357.529 + 0.98560028 * d) % 360)
+        q = (280.459 + 0.98564736 * d) % 360
+        lam = np.radians(q + 1.915 * np.sin(g) + 0.020 * np.sin(2 * g))
+        eps = np.radians(23.439 - 0.00000036 * d)
+        ra = np.degrees(np.arctan2(np.cos(eps) * np.sin(lam), np.cos(lam))) / 15.0
+        decl = np.arcsin(np.sin(eps) * np.sin(lam))
+        eqt = (q / 15.0 - ra % 24 + 12) % 24 - 12
+        return decl, 12 + tz - lon / 15.0 - eqt
+
+    def event(guess, altitude_fn, sign):
+        t = guess
+        for _ in range(3):
+            decl, noon = position(t)
+            cos_h = ((np.sin(np.radians(altitude_fn(decl))) - np.sin(phi) * np.sin(decl))
+                     / (np.cos(phi) * np.cos(decl)))
+            with np.errstate(invalid="ignore"):
+                t = noon + sign * np.degrees(np.arccos(cos_h)) / 15.0  # |cos_h| > 1 -> NaN
+        return t
+
+    def asr_altitude(decl):
+        return np.degrees(np.arctan(1.0 / (IKINDI_GOLGE + np.tan(np.abs(phi - decl)))))
+
+    noon = position(position(np.full(jd0.shape, 12.0))[1])[1]
+    raw = {
+        "Imsak": event(noon - 6, lambda decl: -IMSAK_ACISI, -1),
+        "Gunes": event(noon - 6, lambda decl: -DOGUS_BATIS_ACISI, -1),
+        "Ogle": noon,
+        "Ikindi": event(noon + 3, asr_altitude, 1),
+        "Aksam": event(noon + 6, lambda decl: -DOGUS_BATIS_ACISI, 1),
+        "Yatsi": event(noon + 6, lambda decl: -YATSI_ACISI, 1),
+    }
+
+    out = np.empty(jd0.shape + (len(VAKIT_ANAHTARLARI),), dtype=np.int16)
+    for i, key in enumerate(VAKIT_ANAHTARLARI):
+        minutes = np.floor((raw[key] + TEMKIN[key] / 60.0) * 60 + 0.5)
+        valid = np.isfinite(minutes)
+        out[..., i] = np.where(valid, np.mod(np.where(valid, minutes, 0), 24 * 60), -1)
+    return out
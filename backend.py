@@ -1,168 +1,947 @@
-import os
-import json
-import requests
+import time
 import datetime
-from PyQt6.QtCore import QUrl, QTimer, QObject
-from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput
-from tasarim import CACHE_PATH, SOUND_PATH_BIP, SOUND_PATH_EZAN, SOUND_PATH_SABAHEZAN
+import random
+import threading
+from collections import OrderedDict
+from PyQt6.QtCore import QTimer, QObject, QThread, pyqtSignal
+from yollar import CACHE_PATH, CACHE_DB_PATH, LOCATION_INDEX_PATH
+from onbellek import TimetableStore, to_iso, index_by_date
+from arama import DistrictIndex
+from cizelge import CompactTimeline
+from vakit import PrayerDay
+import astronomi
 
 # Emushaf API Endpoints
 API_BASE = "https://ezanvakti.emushaf.net"
 
-class NamazBackend(QObject):
+# Cache saklama politikası (varsayılanlar)
+DEFAULT_MAX_DISTRICTS = 16    # Bellekte ve diskte tutulacak en fazla ilçe (LRU)
+DEFAULT_RETENTION_DAYS = 31   # Bugünden bu kadar gün önceki veriler silinir
+
+# Arka plan ön-yükleme (prefetch)
+PREFETCH_MIN_DAYS = 7                  # Bugünden itibaren en az bu kadar gün cache'te olmalı
+PREFETCH_URGENT_DAYS = 2               # Bunun altına düşerse düşük trafik saatini beklemeden yenile
+PREFETCH_CHECK_MS = 30 * 60 * 1000     # Ufuk kontrol aralığı
+PREFETCH_QUIET_HOURS = (2, 5)          # Düşük trafik penceresi (yerel saat, 02:00-05:00)
+
+# /vakitler/{ilçe} bugünden itibaren bu kadar gün döner (daha ilerisi / gerisi API'den alınamaz)
+API_WINDOW_DAYS = 30
+
+# Toplu çekme (fetch_many) ve API hız sınırı (tüm istekler için ortak)
+DEFAULT_FETCH_WORKERS = 4
+DEFAULT_RATE_PER_SEC = 4.0   # Saniyede en fazla istek (API kısıtlamasına takılmamak için)
+DEFAULT_RATE_BURST = 4       # Boşta biriken en fazla hak (tek tük istekler beklemez)
+
+# Ülke / şehir / ilçe listeleri nadiren değişir: uzun TTL, süresi geçince arka planda yenilenir
+LOCATION_TTL_SEC = 30 * 24 * 3600
+
+# Koşullu istek (ETag) için yanıtı bellekte tutulan URL sayısı: max_districts + bu kadar (LRU)
+HTTP_CACHE_EXTRA = 32
+
+# Dayanıklılık: eski veriyi hemen sun + arka planda yenile, geçici hatalarda tekrar dene,
+# art arda hatalarda devreyi aç (istekler 5 sn timeout beklemeden hemen başarısız olur)
+STALE_AFTER_SEC = 7 * 24 * 3600   # İlçe penceresi bundan eskiyse 'stale' işaretlenir, yenilenir
+RETRY_ATTEMPTS = 3                # Geçici hata (bağlantı, timeout, 5xx, 429) için toplam deneme
+RETRY_BASE_DELAY = 0.5            # Üstel bekleme tabanı (sn): 0.5, 1, 2... (full jitter)
+RETRY_MAX_DELAY = 4.0
+BREAKER_THRESHOLD = 3             # Art arda bu kadar başarısız çağrı -> devre açık
+BREAKER_COOLDOWN = 30.0           # Açık devrenin ilk deneme öncesi beklemesi (sn)
+BREAKER_MAX_COOLDOWN = 300.0      # Deneme de başarısızsa bekleme ikiye katlanır, en fazla bu kadar
+
+# Önbellek yazımları arka planda, bu kadar saniyelik güncellemeler toplanıp tek seferde diske yazılır
+WRITE_BEHIND_DELAY = 1.0
+
+# Kapanışta çalışan worker thread'leri en fazla bu kadar beklenir (tek isteğin 5 sn timeout'u + pay)
+SHUTDOWN_WAIT_MS = 6000
+
+DEFAULT_TZ_HOURS = 3.0  # Türkiye (UTC+3); ilçenin cache'li verisi yoksa çevrimdışı hesapta kullanılır
+
+
+def create_session():
+    """API için keep-alive, bağlantı havuzlu bir oturum oluşturur."""
+    # requests ilk ağ isteğinde yüklenir; cache'ten cevaplanan açılışlar bu maliyeti ödemez
+    import requests
+    from requests.adapters import HTTPAdapter
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=8)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"Accept": "application/json"})
+    return session
+
+
+class RateLimiter:
+    """Token bucket: saniyede rate hak birikir (en fazla burst), her istek bir hak harcar."""
+
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Bir hak alır; yoksa hak birikene kadar çağıran thread'i bekletir."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    """
+    closed: istekler serbest. threshold kadar art arda hata -> open: istekler hemen reddedilir.
+    cooldown dolunca -> half_open: tek bir deneme isteğine izin verilir; başarılıysa closed,
+    başarısızsa cooldown ikiye katlanarak tekrar open.
+    """
+
+    def __init__(self, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN, max_cooldown=BREAKER_MAX_COOLDOWN):
+        self.threshold = threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.failures = 0          # Art arda başarısız çağrı
+        self.opened_at = 0.0
+        self.rejected = 0          # Devre açıkken reddedilen çağrı
+        self.last_error = None
+        self._trial = False        # half_open'da deneme isteği sürüyor mu
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = "half_open"
+                self._trial = False
+            if self.state == "closed" or (self.state == "half_open" and not self._trial):
+                self._trial = self.state == "half_open"
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self.cooldown = self.base_cooldown
+            self._trial = False
+
+    def record_failure(self, error):
+        with self._lock:
+            self.failures += 1
+            self.last_error = str(error)
+            if self.state == "half_open":
+                self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+            if self.state == "half_open" or self.failures >= self.threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+            self._trial = False
+
+    def retry_in(self):
+        """Açık devrenin deneme isteğine kalan süre (sn)."""
+        with self._lock:
+            if self.state != "open":
+                return 0.0
+            return max(0.0, self.cooldown - (time.monotonic() - self.opened_at))
+
+    def snapshot(self):
+        retry_in = self.retry_in()
+        with self._lock:
+            return {"state": self.state, "failures": self.failures, "rejected": self.rejected,
+                    "retry_in": round(retry_in, 1), "cooldown": self.cooldown, "last_error": self.last_error}
+
+
+class _Flight:
+    """Devam eden tek bir çağrı: bekleyenler aynı sonucu alır."""
+    __slots__ = ("done", "result")
+
     def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+
+
+# --- VAKİT ÇEKME İŞ PARÇACIĞI (THREAD) ---
+class FetchWorker(QThread):
+    result = pyqtSignal(int, object, object)  # (istek_no, data, error)
+
+    def __init__(self, backend, request_id, district_id, date_str):
         super().__init__()
-        self.data_cache = {}
+        self.backend = backend
+        self.request_id = request_id
+        self.district_id = district_id
+        self.date_str = date_str
+
+    def run(self):
+        # Cache'e fetch_namaz_times_async zaten baktı (ıskalama bir kez sayılır)
+        data, error = self.backend._fetch_uncached(self.district_id, self.date_str)
+        self.result.emit(self.request_id, data, error)
+
+
+class LocationWorker(QThread):
+    done = pyqtSignal(str, object, object, bool)  # (path, liste, error, değişti mi)
+
+    def __init__(self, backend, path, known):
+        super().__init__()
+        self.backend = backend
+        self.path = path
+        self.known = known  # Cache'teki liste (yenileme) veya None (ilk çekme)
+
+    def run(self):
+        data, error = self.backend._fetch_location_list(self.path)
+        if self.known is not None:
+            # Yenileme: hata sessizce yutulur, cache'teki liste kullanılmaya devam eder
+            self.done.emit(self.path, data, None, not error and data != self.known)
+        else:
+            self.done.emit(self.path, data, error, True)
+
+
+class IndexWorker(QThread):
+    done = pyqtSignal(object)  # DistrictIndex
+
+    def __init__(self, backend, country_name):
+        super().__init__()
+        self.backend = backend
+        self.country_name = country_name
+
+    def run(self):
+        self.backend.fill_location_hierarchy(self.country_name)
+        self.done.emit(self.backend.get_location_index())
+
+
+class PrefetchWorker(QThread):
+    done = pyqtSignal(str, object)  # (district_id, error)
+
+    def __init__(self, backend, district_id):
+        super().__init__()
+        self.backend = backend
+        self.district_id = district_id
+
+    def run(self):
+        self.done.emit(self.district_id, self.backend.refresh_district(self.district_id))
+
+
+class NamazBackend(QObject):
+    # Asenkron vakit sonucu: (istek_no, data, error)
+    times_ready = pyqtSignal(int, object, object)
+    # Konum listesi: (API yolu, liste, error)
+    locations_ready = pyqtSignal(str, object, object)
+    # İlçe arama indeksi (arama.DistrictIndex)
+    location_index_ready = pyqtSignal(object)
+
+    def __init__(self, max_districts=DEFAULT_MAX_DISTRICTS, retention_days=DEFAULT_RETENTION_DAYS):
+        super().__init__()
+        self.store = None
+        # İlçe başına birleştirilmiş zaman çizelgesi: {district_id: CompactTimeline (ISO tarih -> gün)}
+        # Sıra = son kullanım (LRU), en eski baştadır.
+        self.data_cache = OrderedDict()
+        self.max_districts = max_districts
+        self.retention_days = retention_days
+        self.cache_stats = {"hits": 0, "misses": 0, "evictions": 0, "disk_evictions": 0, "purged_days": 0,
+                            "computed": 0, "flights": 0, "coalesced": 0, "stale": 0, "retries": 0}
+        self._updated = {}  # district_id -> pencerenin son yazılma zamanı (epoch), stale kontrolü için
+        self._revalidating = set()
+        self._coords = {}  # district_id -> (enlem, boylam, saat dilimi), çevrimdışı hesap için
+        # Backend hem GUI hem de worker thread'lerinden kullanılıyor
+        self._lock = threading.RLock()
+        self._request_seq = 0
+        self._active_request = 0
+        self._workers = set()
+        self._flights = {}  # anahtar -> _Flight (aynı anahtar için tek istek / tek cache yazımı)
+        self._location_workers = {}  # path -> LocationWorker (aynı liste için tek istek)
+        self.location_index = None
+        self._index_worker = None
+        self._closing = False  # shutdown() sonrası yeni ağ isteği atılmaz
         self.load_cache()
+
+        # HTTP: Tek oturum (TCP/TLS bağlantısı tekrar kullanılır) + koşullu istek doğrulayıcıları
+        self.session = None  # İlk ağ isteğinde kurulur (create_session)
+        self._http_cache = OrderedDict()  # url -> {"etag", "last_modified", "data"} (LRU, sınırlı)
+        self.rate_limiter = RateLimiter(DEFAULT_RATE_PER_SEC, DEFAULT_RATE_BURST)
+        self.breaker = CircuitBreaker()
+
+        # Ön-yükleme zamanlayıcısı: takip edilen ilçenin ileri günleri hep cache'te kalsın
+        self.prefetch_district = None
+        self._prefetch_worker = None
+        self.prefetch_check_timer = QTimer(self)
+        self.prefetch_check_timer.timeout.connect(self.check_prefetch)
+        self.prefetch_run_timer = QTimer(self)
+        self.prefetch_run_timer.setSingleShot(True)
+        self.prefetch_run_timer.timeout.connect(self._start_prefetch)
         
-        # Medya Oynatıcı
-        self.player = QMediaPlayer()
-        self.audio_output = QAudioOutput()
-        self.player.setAudioOutput(self.audio_output)
-        self.audio_output.setVolume(1.0)
-        self.stop_btn_ref = None
 
     # --- CACHE YÖNETİMİ ---
     def load_cache(self):
-        if os.path.exists(CACHE_PATH):
-            try:
-                with open(CACHE_PATH, "r", encoding="utf-8") as f:
-                    self.data_cache = json.load(f)
-            except:
-                self.data_cache = {}
+        """SQLite önbelleğini açar; eski JSON cache varsa bir kereliğine içeri aktarır."""
+        self.store = TimetableStore(CACHE_DB_PATH, write_delay=WRITE_BEHIND_DELAY)
+        self.store.migrate_json(CACHE_PATH)
+        self.enforce_cache_policy()
+        # Disk tarafı politika, yeni günler diske aktarıldıktan sonra yazıcı thread'inde uygulanır
+        self.store.after_flush = self._enforce_disk_policy
+
+    def set_cache_policy(self, max_districts=None, retention_days=None):
+        """Saklama politikasını değiştirir ve hemen uygular."""
+        with self._lock:
+            if max_districts is not None:
+                self.max_districts = max(1, max_districts)
+            if retention_days is not None:
+                self.retention_days = max(0, retention_days)
+        self.enforce_cache_policy()
+
+    def retention_cutoff(self):
+        """Bu ISO tarihten eski günler cache'te tutulmaz."""
+        return (datetime.date.today() - datetime.timedelta(days=self.retention_days)).isoformat()
+
+    def enforce_cache_policy(self):
+        """Eski günleri siler, ilçe sayısını sınırlar (bellek + disk)."""
+        self._enforce_disk_policy()
+        self._enforce_memory_policy()
+
+    def _enforce_disk_policy(self):
+        purged = self.store.purge_before(self.retention_cutoff())
+        disk_evicted = self.store.trim_districts(self.max_districts)
+        with self._lock:
+            self.cache_stats["purged_days"] += purged
+            self.cache_stats["disk_evictions"] += len(disk_evicted)
+            for district_id in disk_evicted:
+                self.data_cache.pop(district_id, None)
+
+    def _enforce_memory_policy(self):
+        cutoff = self.retention_cutoff()
+        with self._lock:
+            for timeline in self.data_cache.values():
+                timeline.drop_before(cutoff)
+            self._evict_lru()
+
+    def get_cache_stats(self):
+        """İsabet / ıskalama / tahliye sayaçları ve anlık boyutlar."""
+        with self._lock:
+            stats = dict(self.cache_stats)
+            stats["districts"] = len(self.data_cache)
+            stats["days"] = sum(len(t) for t in self.data_cache.values())
+        stats["disk_flushes"] = self.store.flushes
+        stats["disk_pending"] = self.store.pending()
+        return stats
+
+    def _evict_lru(self):
+        while len(self.data_cache) > self.max_districts:
+            self.data_cache.popitem(last=False)
+            self.cache_stats["evictions"] += 1
+
+    # --- HTTP ---
+    def set_rate_limit(self, rate_per_sec, burst=None):
+        """Tüm API istekleri için ortak hız sınırı (istek / sn)."""
+        self.rate_limiter = RateLimiter(max(0.1, rate_per_sec), burst or DEFAULT_RATE_BURST)
 
-    def save_cache(self):
+    def get_circuit_state(self):
+        """Devre kesici durumu: {"state": closed/open/half_open, "failures", "rejected", "retry_in", ...}"""
+        return self.breaker.snapshot()
+
+    def _api_get(self, path):
+        """
+        API'ye GET atar, (status, data) döner. Geçici hatalar (bağlantı, timeout, 5xx, 429)
+        üstel bekleme + jitter ile tekrar denenir. Art arda başarısız çağrılar devreyi açar;
+        devre açıkken istek atılmadan CircuitOpenError yükselir. Bağlantı hataları çağırana yükselir.
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"API erişilemiyor, {self.breaker.retry_in():.0f} sn sonra tekrar denenecek")
         try:
-            with open(CACHE_PATH, "w", encoding="utf-8") as f:
-                json.dump(self.data_cache, f, ensure_ascii=False)
-        except:
-            pass
+            status, data = self._api_get_retrying(path)
+        except Exception as e:
+            self.breaker.record_failure(e)
+            raise
+        if status >= 500 or status == 429:
+            self.breaker.record_failure(f"HTTP {status}")
+        else:
+            self.breaker.record_success()
+        return status, data
+
+    def _api_get_retrying(self, path):
+        import requests
+        for attempt in range(RETRY_ATTEMPTS):
+            last = attempt == RETRY_ATTEMPTS - 1
+            try:
+                status, data = self._api_get_once(path)
+                if last or not (status >= 500 or status == 429):
+                    return status, data
+            except (requests.ConnectionError, requests.Timeout):
+                if last:
+                    raise
+            # Full jitter: aynı anda düşen istemciler aynı anda tekrar denemesin
+            with self._lock:
+                self.cache_stats["retries"] += 1
+            time.sleep(random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt)))
+
+    def _api_get_once(self, path):
+        """
+        Ortak oturum üzerinden tek GET. Sunucu ETag / Last-Modified verdiyse istek koşullu gider;
+        304 gelirse gövde tekrar indirilmez, önceki veri 200 gibi döner.
+        """
+        url = f"{API_BASE}{path}"
+        with self._lock:
+            validators = self._http_cache.get(url)
+            if validators:
+                self._http_cache.move_to_end(url)
+
+        headers = {}
+        if validators:
+            if validators["etag"]:
+                headers["If-None-Match"] = validators["etag"]
+            if validators["last_modified"]:
+                headers["If-Modified-Since"] = validators["last_modified"]
 
-    # --- KONUM VERİLERİ (API) ---
+        if self._closing:
+            # Kapanışta kuyruktaki / tekrar denenen istekler beklenmez (shutdown thread'leri bekliyor)
+            raise RuntimeError("Uygulama kapanıyor")
+        with self._lock:
+            if self.session is None:
+                self.session = create_session()
+        self.rate_limiter.acquire()
+        resp = self.session.get(url, headers=headers, timeout=5)
+        if resp.status_code == 304 and validators:
+            return 200, validators["data"]
+        if resp.status_code != 200:
+            return resp.status_code, None
+
+        data = resp.json()
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        if etag or last_modified:
+            with self._lock:
+                self._http_cache[url] = {"etag": etag, "last_modified": last_modified, "data": data}
+                self._http_cache.move_to_end(url)
+                while len(self._http_cache) > self.max_districts + HTTP_CACHE_EXTRA:
+                    self._http_cache.popitem(last=False)
+        return 200, data
+
+    # --- KONUM VERİLERİ (API + disk cache) ---
     def get_countries(self):
         """Ülke listesini çeker."""
-        try:
-            resp = requests.get(f"{API_BASE}/ulkeler", timeout=5)
-            if resp.status_code == 200:
-                return resp.json(), None
-            return [], "Veri alınamadı"
-        except Exception as e:
-            return [], str(e)
+        return self.get_location_list("/ulkeler")
 
     def get_cities(self, country_id):
         """Seçilen ülkenin şehirlerini çeker."""
-        try:
-            resp = requests.get(f"{API_BASE}/sehirler/{country_id}", timeout=5)
-            if resp.status_code == 200:
-                return resp.json(), None
-            return [], "Veri alınamadı"
-        except Exception as e:
-            return [], str(e)
+        return self.get_location_list(f"/sehirler/{country_id}")
 
     def get_districts(self, city_id):
         """Seçilen şehrin ilçelerini çeker."""
+        return self.get_location_list(f"/ilceler/{city_id}")
+
+    def get_location_list(self, path):
+        """
+        Konum listesi (senkron): TTL içindeki cache'ten, yoksa API'den.
+        API'ye ulaşılamazsa süresi geçmiş cache de kabul edilir. (liste, error) döner.
+        """
+        cached = self.store.get_list(path)
+        if cached and time.time() - cached[1] < LOCATION_TTL_SEC:
+            return cached[0], None
+        data, error = self._fetch_location_list(path)
+        if error and cached:
+            return cached[0], None
+        return data, error
+
+    def _fetch_location_list(self, path):
+        """API'den çeker ve cache'e yazar: (liste, error). Aynı liste için eşzamanlı çağrılar birleşir."""
+        return self._single_flight(("list", path), lambda: self._get_location_list(path))
+
+    def _get_location_list(self, path):
         try:
-            resp = requests.get(f"{API_BASE}/ilceler/{city_id}", timeout=5)
-            if resp.status_code == 200:
-                return resp.json(), None
+            status, data = self._api_get(path)
+            if status == 200:
+                self.store.put_list(path, data)
+                return data, None
             return [], "Veri alınamadı"
         except Exception as e:
             return [], str(e)
 
+    def request_location_list(self, path):
+        """
+        GUI'yi bloklamayan sürüm; sonuç locations_ready(path, liste, error) ile gelir.
+        Cache'te varsa hemen yayınlanır (süresi geçmişse arka planda yenilenir,
+        liste değiştiyse sinyal tekrar gelir). Yoksa arka planda API'den çekilir.
+        """
+        cached = self.store.get_list(path)
+        if cached:
+            self.locations_ready.emit(path, cached[0], None)
+            if time.time() - cached[1] < LOCATION_TTL_SEC:
+                return
+        self._start_location_worker(path, cached[0] if cached else None)
+
+    def _start_location_worker(self, path, known):
+        if path in self._location_workers:
+            return
+        worker = LocationWorker(self, path, known)
+        worker.done.connect(self._on_location_done)
+        worker.finished.connect(self._on_location_worker_finished)
+        self._location_workers[path] = worker
+        worker.start()
+
+    def _on_location_done(self, path, data, error, changed):
+        # Arka plan doğrulaması aynı listeyi döndürdüyse tekrar doldurmaya gerek yok
+        if changed:
+            self.locations_ready.emit(path, data, error)
+
+    def _on_location_worker_finished(self):
+        worker = self.sender()
+        if worker:
+            self._location_workers.pop(worker.path, None)
+            worker.deleteLater()
+
+    # --- KONUM ARAMA İNDEKSİ ---
+    def get_location_index(self):
+        """
+        Cache'teki tüm ilçe listelerinin arama indeksi (ağa çıkmaz). Diskteki indeks
+        listeler değişmediyse aynen kullanılır, değiştiyse yeniden kurulup kaydedilir.
+        """
+        signature = self.store.lists_signature()
+        with self._lock:
+            index = self.location_index
+        if index is None or index.signature != signature:
+            if index is None:
+                index = DistrictIndex.load(LOCATION_INDEX_PATH)
+            if index is None or index.signature != signature:
+                index = self._build_location_index(signature)
+            with self._lock:
+                self.location_index = index
+        return index
+
+    def _build_location_index(self, signature):
+        cached = self.store.get_list("/ulkeler")
+        countries = {str(c["UlkeID"]): c["UlkeAdi"] for c in (cached[0] if cached else [])}
+        cities = {}  # şehir id -> (şehir adı, ülke adı)
+        for path, items in self.store.iter_lists("/sehirler/"):
+            country = countries.get(path.rsplit("/", 1)[1], "")
+            for c in items:
+                cities[str(c["SehirID"])] = (c["SehirAdi"], country)
+
+        entries = []
+        for path, items in self.store.iter_lists("/ilceler/"):
+            city, country = cities.get(path.rsplit("/", 1)[1], ("", ""))
+            for d in items:
+                entries.append((str(d["IlceID"]), d["IlceAdi"], city, country))
+        entries.sort(key=lambda e: (e[3], e[2], e[1]))
+
+        index = DistrictIndex(entries, signature)
+        try:
+            index.save(LOCATION_INDEX_PATH)
+        except OSError:
+            pass
+        return index
+
+    def fill_location_hierarchy(self, country_name="TÜRKİYE"):
+        """
+        Ülkenin şehirlerinden ilçe listesi cache'te olmayanları (hız sınırıyla, eşzamanlı)
+        çeker; arama tüm ilçeleri kapsasın. Hata mesajı veya None döner.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        countries, error = self.get_countries()
+        if error:
+            return error
+        country_id = next((c["UlkeID"] for c in countries if c["UlkeAdi"] == country_name), None)
+        if country_id is None:
+            return "Ülke bulunamadı"
+        cities, error = self.get_cities(country_id)
+        if error:
+            return error
+        missing = [f"/ilceler/{c['SehirID']}" for c in cities
+                   if self.store.get_list(f"/ilceler/{c['SehirID']}") is None]
+        if not missing:
+            return None
+        with ThreadPoolExecutor(max_workers=DEFAULT_FETCH_WORKERS) as pool:
+            errors = [e for _, e in pool.map(self._fetch_location_list, missing) if e]
+        return errors[0] if errors else None
+
+    def request_location_index(self, country_name="TÜRKİYE"):
+        """
+        location_index_ready sinyali: eldeki indeks hemen yayınlanır; ülkenin eksik
+        ilçe listeleri arka planda tamamlanınca güncel indeks tekrar yayınlanır.
+        """
+        index = self.get_location_index()
+        self.location_index_ready.emit(index)
+        if self._index_worker:
+            return
+        self._index_worker = IndexWorker(self, country_name)
+        self._index_worker.done.connect(self._on_index_done)
+        self._index_worker.start()
+
+    def _on_index_done(self, index):
+        worker = self._index_worker
+        self._index_worker = None
+        if worker:
+            worker.wait()
+            worker.deleteLater()
+        self.location_index_ready.emit(index)
+
     # --- VAKİT VERİLERİ ---
     def fetch_namaz_times(self, district_id, date_str):
         """
-        Belirtilen ilçe ID'si için vakitleri getirir.
+        Belirtilen ilçe ID'si için vakitleri getirir: (PrayerDay, None) veya (None, hata).
         date_str formatı: "dd.MM.yyyy" (Örn: 14.01.2026)
         """
-        # Cache Key: ilceID_Ay_Yil (API aylık veri döndüğü için cache key'i aylık yapıyoruz)
-        try:
-            day, month, year = date_str.split('.')
-            cache_key = f"times_{district_id}_{month}_{year}"
-        except:
+        if to_iso(date_str) is None:
             return None, "Tarih formatı hatası"
 
         # 1. Önce Cache'e bak
-        if cache_key in self.data_cache:
-            monthly_data = self.data_cache[cache_key]
-            day_data = self.find_day_in_list(monthly_data, date_str)
-            if day_data:
-                return self.map_to_internal_format(day_data), None
+        cached = self.lookup_cached(district_id, date_str)
+        if cached:
+            return cached, None
+        return self._fetch_uncached(district_id, date_str)
+
+    def _fetch_uncached(self, district_id, date_str):
+        """
+        fetch_namaz_times'ın cache'e bakmayan kısmı: API, olmazsa çevrimdışı hesap.
+        Cache'e önceden bakılmış olmalı (isabet / ıskalama sayaçları çağıranda sayılır).
+        """
+        if to_iso(date_str) is None:
+            return None, "Tarih formatı hatası"
 
         # 2. Cache'de yoksa API'den çek (API 30 günlük veri döner)
+        error = self.refresh_district(district_id)
+        if not error:
+            # İstenen günü bul
+            day = self.get_timeline(district_id).get(to_iso(date_str))
+            if day:
+                return day, None
+            error = "Seçilen tarih için veri bulunamadı."
+
+        # 3. Ağ da cache de cevap veremediyse koordinattan hesapla (computed = True)
+        computed = self.compute_offline(district_id, date_str)
+        if computed:
+            return computed, None
+        return None, error
+
+    def refresh_district(self, district_id):
+        """
+        İlçenin 30 günlük penceresini API'den çekip cache'e birleştirir. Hata mesajı veya None döner.
+        Aynı ilçe için eşzamanlı çağrılar tek istek ve tek cache yazımını paylaşır.
+        """
+        return self._single_flight(("refresh", str(district_id)), lambda: self._refresh_district(district_id))
+
+    def _refresh_district(self, district_id):
+        data_list, error = self._fetch_window(district_id)
+        if error:
+            return error
+        # 30 günlük pencereyi ilçe zaman çizelgesine birleştir
+        self.merge_days(district_id, data_list)
+        return None
+
+    def _fetch_window(self, district_id):
+        """/vakitler isteği: (gün listesi, error). Cache'e yazmaz. Eşzamanlı aynı istekler birleşir."""
+        path = f"/vakitler/{district_id}"
+        return self._single_flight(("get", path), lambda: self._get_window(path))
+
+    def _get_window(self, path):
         try:
-            resp = requests.get(f"{API_BASE}/vakitler/{district_id}", timeout=5)
-            if resp.status_code == 200:
-                data_list = resp.json()
-                
-                # Veriyi cache'e kaydet
-                self.data_cache[cache_key] = data_list
-                self.save_cache()
-
-                # İstenen günü bul
-                day_data = self.find_day_in_list(data_list, date_str)
-                if day_data:
-                    return self.map_to_internal_format(day_data), None
+            status, data_list = self._api_get(path)
+            if status != 200:
+                return None, f"API Hatası: {status}"
+            return data_list, None
+        except Exception as e:
+            return None, f"Bağlantı Hatası: {str(e)}"
+
+    def _single_flight(self, key, fn):
+        """
+        key için devam eden bir çağrı varsa onun sonucunu bekler, yoksa fn'i çalıştırır.
+        fn hata fırlatmamalı (hatalar sonuç olarak döner), bekleyenlerin hepsi aynı sonucu alır.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                self.cache_stats["flights"] += 1
+                leader = True
+            else:
+                self.cache_stats["coalesced"] += 1
+                leader = False
+
+        if not leader:
+            flight.done.wait()
+            return flight.result
+        try:
+            flight.result = fn()
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result
+
+    def fetch_many(self, district_ids, max_workers=DEFAULT_FETCH_WORKERS):
+        """
+        Birden çok ilçenin 30 günlük penceresini sınırlı bir thread havuzunda çeker.
+        İstekler ortak hız sınırına (rate_limiter) tabidir. Cache'e, tüm istekler
+        bittikten sonra tek transaction'da yazılır (saklama politikası yine uygulanır:
+        max_districts'ten fazla ilçe ısıtılacaksa önce set_cache_policy ile artırılmalı).
+        {district_id: (ISO tarih -> gün kaydı, error)} döner.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        ids = list(dict.fromkeys(str(d) for d in district_ids if d))
+        if not ids:
+            return {}
+
+        windows = {}
+        results = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(ids)))) as pool:
+            for district_id, (data_list, error) in zip(ids, pool.map(self._fetch_window, ids)):
+                if error:
+                    results[district_id] = (None, error)
                 else:
-                    return None, "Seçilen tarih için veri bulunamadı."
+                    windows[district_id] = data_list
+
+        for district_id, days in self.merge_many(windows).items():
+            results[district_id] = (days, None)
+        return {district_id: results[district_id] for district_id in ids}
+
+    def get_timeline(self, district_id):
+        """İlçenin ISO tarih -> gün kaydı eşlemesi (CompactTimeline). İlk erişimde SQLite'tan yüklenir."""
+        key = str(district_id)
+        with self._lock:
+            timeline = self.data_cache.get(key)
+            if timeline is not None:
+                self.data_cache.move_to_end(key)
             else:
-                return None, f"API Hatası: {resp.status_code}"
+                timeline = CompactTimeline.from_days(self.store.load_district(key))
+                self.data_cache[key] = timeline
+                self._updated.setdefault(key, self.store.last_update(key))
+                self._evict_lru()
+        # Bellek isabetleri de disk tarafı LRU'yu günceller (sadece kuyruğa alınır, aktarımda birleşir);
+        # yoksa kullanımdaki ilçe diskten silinir ve bellekten de düşer
+        self.store.touch_district(key)
+        return timeline
 
-        except Exception as e:
-            return None, f"Bağlantı Hatası: {str(e)}"
+    def merge_days(self, district_id, data_list):
+        """
+        API'nin gün listesini ilçe zaman çizelgesine birleştirir.
+        Çakışan 30 günlük pencerelerde aynı gün tekrar saklanmaz, yerinde güncellenir.
+        """
+        self.merge_many({district_id: data_list})
+        self.get_timeline(district_id)
 
-    def find_day_in_list(self, data_list, target_date_str):
-        """API'den gelen liste içinde hedef tarihi bulur."""
-        for item in data_list:
-            # API 'MiladiTarihKisa' dönüyor: "14.01.2026"
-            if item.get("MiladiTarihKisa") == target_date_str:
-                return item
-        return None
+    def merge_many(self, district_lists):
+        """
+        {district_id: API gün listesi} - tüm ilçeleri tek seferde disk kuyruğuna alır (arka planda
+        yazılır), bellekte yüklü zaman çizelgelerini günceller. Yazılan {district_id: günler} döner.
+        """
+        cutoff = self.retention_cutoff()
+        batch = {str(district_id): {d: item for d, item in index_by_date(data_list).items() if d >= cutoff}
+                 for district_id, data_list in district_lists.items()}
+        if not batch:
+            return batch
+        # Önce disk kuyruğu: bu arada yüklenen bir zaman çizelgesi yeni günleri de görür.
+        # Erişim zamanı önce yazılır ki disk politikası yeni ilçeleri eski sanıp silmesin.
+        self.store.touch_districts(batch)
+        self.store.put_many(batch)
+        now = time.time()
+        with self._lock:
+            for district_id, days in batch.items():
+                self._updated[district_id] = now
+                timeline = self.data_cache.get(district_id)
+                if timeline is not None:
+                    timeline.update(days)
+        self._enforce_memory_policy()
+        return batch
+
+    def lookup_cached(self, district_id, date_str):
+        """
+        Sadece cache'e bakar, ağa çıkmaz. PrayerDay veya yoksa None döner.
+        İlçe penceresi STALE_AFTER_SEC'ten eskiyse veri yine hemen döner (stale = True)
+        ve pencere arka planda yenilenir.
+        """
+        iso_date = to_iso(date_str)
+        day = self.get_timeline(district_id).get(iso_date) if iso_date else None
+        with self._lock:
+            self.cache_stats["hits" if day else "misses"] += 1
+            stale = day is not None and time.time() - self._updated.get(str(district_id), 0) > STALE_AFTER_SEC
+            if stale:
+                self.cache_stats["stale"] += 1
+        if day is None:
+            return None
+        if stale:
+            day = day.as_stale()
+            self.revalidate(district_id)
+        return day
+
+    def revalidate(self, district_id):
+        """İlçe penceresini arka plan thread'inde yeniler (devre açıksa denemez, eşzamanlılar birleşir)."""
+        key = str(district_id)
+        with self._lock:
+            if key in self._revalidating or self.breaker.retry_in() > 0:
+                return
+            self._revalidating.add(key)
+
+        def run():
+            try:
+                self.refresh_district(key)
+            finally:
+                with self._lock:
+                    self._revalidating.discard(key)
+        threading.Thread(target=run, daemon=True).start()
+
+    # --- ÇEVRİMDIŞI HESAP ---
+    def set_coordinates(self, district_id, lat, lon, tz_hours=DEFAULT_TZ_HOURS):
+        """İlçenin koordinatını kaydeder (API'ye ulaşılamazsa vakitler buradan hesaplanır)."""
+        key = str(district_id)
+        coords = (float(lat), float(lon), float(tz_hours))
+        with self._lock:
+            if self._coords.get(key) == coords:
+                return
+            self._coords[key] = coords
+        self.store.set_location(key, *coords)
+
+    def get_coordinates(self, district_id):
+        """(enlem, boylam, saat dilimi) veya None."""
+        key = str(district_id)
+        with self._lock:
+            coords = self._coords.get(key)
+        if coords is None:
+            coords = self.store.get_location(key)
+            if coords:
+                with self._lock:
+                    self._coords[key] = tuple(coords)
+        return coords
+
+    def compute_offline(self, district_id, date_str):
+        """Koordinattan hesaplanmış vakitler (PrayerDay, computed) veya koordinat bilinmiyorsa None. Cache'e yazılmaz."""
+        coords = self.get_coordinates(district_id)
+        iso_date = to_iso(date_str)
+        if not coords or not iso_date:
+            return None
+        lat, lon, tz_hours = coords
+        item = astronomi.compute_day(datetime.date.fromisoformat(iso_date), lat, lon, tz_hours)
+        if item is None:
+            return None
+        with self._lock:
+            self.cache_stats["computed"] += 1
+        return PrayerDay.from_api(item)
+
+    # --- ARKA PLAN ÖN-YÜKLEME ---
+    def set_prefetch_district(self, district_id):
+        """Ufku takip edilecek ilçeyi ayarlar ve periyodik kontrolü başlatır (None: durdur)."""
+        district_id = str(district_id) if district_id else None
+        if district_id == self.prefetch_district and self.prefetch_check_timer.isActive():
+            return
+        self.prefetch_district = district_id
+        self.prefetch_run_timer.stop()
+        if not district_id:
+            self.prefetch_check_timer.stop()
+            return
+        self.prefetch_check_timer.start(PREFETCH_CHECK_MS)
+        self.check_prefetch()
+
+    def cached_horizon(self, district_id):
+        """Bugünden başlayarak kesintisiz cache'te olan gün sayısı."""
+        timeline = self.get_timeline(district_id)
+        day = datetime.date.today()
+        count = 0
+        while day.isoformat() in timeline:
+            count += 1
+            day += datetime.timedelta(days=1)
+        return count
+
+    def check_prefetch(self):
+        """Ufuk eşiğin altındaysa yenilemeyi jitter'lı, düşük trafikli bir zamana kurar."""
+        district_id = self.prefetch_district
+        if not district_id or self.prefetch_run_timer.isActive() or self._prefetch_worker:
+            return
+        horizon = self.cached_horizon(district_id)
+        if horizon >= PREFETCH_MIN_DAYS:
+            return
+        self.prefetch_run_timer.start(self._prefetch_delay_ms(horizon))
+
+    def _prefetch_delay_ms(self, horizon):
+        if horizon < PREFETCH_URGENT_DAYS:
+            # Yarın bile garanti değil: kısa bir jitter ile hemen
+            return random.randint(5, 60) * 1000
+        # Bir sonraki sessiz pencere içinde rastgele bir an (istemciler aynı anda API'ye yüklenmesin)
+        now = datetime.datetime.now()
+        start_h, end_h = PREFETCH_QUIET_HOURS
+        window_start = now.replace(hour=start_h, minute=0, second=0, microsecond=0)
+        if now.hour >= end_h:
+            window_start += datetime.timedelta(days=1)
+        window_start = max(window_start, now)
+        window_end = window_start.replace(hour=end_h, minute=0, second=0, microsecond=0)
+        delay = (window_start - now).total_seconds()
+        delay += random.uniform(0, max(0.0, (window_end - window_start).total_seconds()))
+        return int(delay * 1000)
+
+    def _start_prefetch(self):
+        if not self.prefetch_district or self._prefetch_worker:
+            return
+        self._prefetch_worker = PrefetchWorker(self, self.prefetch_district)
+        self._prefetch_worker.done.connect(self._on_prefetch_done)
+        self._prefetch_worker.start()
+
+    def _on_prefetch_done(self, district_id, error):
+        worker = self._prefetch_worker
+        self._prefetch_worker = None
+        if worker:
+            worker.wait()
+            worker.deleteLater()
+        if error:
+            # Başarısızsa bir sonraki periyodik kontrol tekrar dener
+            return
+        self.check_prefetch()
+
+    # --- ASENKRON VAKİT ÇEKME ---
+    def fetch_namaz_times_async(self, district_id, date_str):
+        """
+        fetch_namaz_times'ın GUI'yi bloklamayan sürümü. İstek numarası döner,
+        sonuç times_ready sinyali ile gelir. Cache'te varsa sinyal hemen yayınlanır.
+        Yeni bir istek, sonucu gelmemiş eski istekleri iptal eder.
+        """
+        self._request_seq += 1
+        request_id = self._request_seq
+        self._active_request = request_id
+
+        cached = self.lookup_cached(district_id, date_str)
+        if cached:
+            self.times_ready.emit(request_id, cached, None)
+            return request_id
+
+        worker = FetchWorker(self, request_id, district_id, date_str)
+        worker.result.connect(self._on_worker_result)
+        worker.finished.connect(self._on_worker_finished)
+        self._workers.add(worker)
+        worker.start()
+        return request_id
+
+    def shutdown(self, timeout_ms=SHUTDOWN_WAIT_MS):
+        """
+        Uygulama kapanırken (aboutToQuit): zamanlayıcıları durdurur, yeni ağ isteklerini keser ve
+        çalışan worker thread'lerini bekler. Qt, çalışan bir QThread yok edilirse süreci sonlandırır.
+        """
+        self._closing = True
+        self.cancel_pending()
+        self.prefetch_check_timer.stop()
+        self.prefetch_run_timer.stop()
+        workers = list(self._workers) + list(self._location_workers.values())
+        workers += [w for w in (self._prefetch_worker, self._index_worker) if w]
+        deadline = time.monotonic() + timeout_ms / 1000
+        for worker in workers:
+            worker.wait(max(0, int((deadline - time.monotonic()) * 1000)))
+        if self.store:
+            self.store.close()
+
+    def cancel_pending(self):
+        """Bekleyen asenkron isteklerin sonuçlarını yok sayar (ağ isteği cache'i yine doldurur)."""
+        self._active_request = 0
+
+    def _on_worker_result(self, request_id, data, error):
+        # Kullanıcı bu arada başka tarihe geçtiyse eski sonucu at
+        if request_id != self._active_request:
+            return
+        self.times_ready.emit(request_id, data, error)
 
-    def map_to_internal_format(self, api_data):
-        """
-        Emushaf (Diyanet) verisini, uygulamanın beklediği Aladhan formatına çevirir.
-        Böylece Main.py'de değişiklik yapmamıza gerek kalmaz.
-        """
-        return {
-            "timings": {
-                "Fajr": api_data["Imsak"],
-                "Sunrise": api_data["Gunes"],
-                "Dhuhr": api_data["Ogle"],
-                "Asr": api_data["Ikindi"],
-                "Maghrib": api_data["Aksam"],
-                "Isha": api_data["Yatsi"]
-            },
-            "date": {
-                "hijri": {
-                    "month": {
-                        # API Hicri ayı metin veya sayı dönebilir, basit bir mapping
-                        "number": 1, # Varsayılan (Main.py zaten tarihi kendi hesaplıyor)
-                        "en": api_data.get("HicriTarihUzun", "") 
-                    },
-                    "day": api_data.get("HicriTarihKisa", "").split('.')[0] if "HicriTarihKisa" in api_data else "1"
-                }
-            }
-        }
-
-    # --- SES ÇALMA ---
-    def play_sound(self, sound_type, duration_sec=0, is_morning=False, is_sun=False):
-        self.player.stop()
-        file_path = SOUND_PATH_BIP
-        loop_count = QMediaPlayer.Loops.Infinite
-
-        if sound_type == "ezan" and not is_sun:
-            file_path = SOUND_PATH_SABAHEZAN if is_morning else SOUND_PATH_EZAN
-            loop_count = 1
-
-        if os.path.exists(file_path):
-            self.player.setSource(QUrl.fromLocalFile(os.path.abspath(file_path)))
-            self.player.setLoops(loop_count)
-            if sound_type != "ezan" and duration_sec > 0:
-                QTimer.singleShot(duration_sec * 1000, self.stop_sound)
-            self.player.play()
-            if self.stop_btn_ref: self.stop_btn_ref.show()
-
-    def stop_sound(self):
-        self.player.stop()
-        if self.stop_btn_ref: self.stop_btn_ref.hide()
\ No newline at end of file
+    def _on_worker_finished(self):
+        worker = self.sender()
+        self._workers.discard(worker)
+        if worker:
+            worker.deleteLater()
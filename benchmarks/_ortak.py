@@ -0,0 +1,88 @@
+"""Benchmark betiklerinin ortak yardımcıları (ağsız, ekransız HUD kurulumu)."""
+import os
+import sys
+import json
+import datetime
+import tempfile
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+FIXTURE_PATH = os.path.join(ROOT, "benchmarks", "fixtures", "vakitler_9541.json")
+FIXTURE_DISTRICT = "9541"  # İstanbul (Merkez)
+
+# Tik / uyanma benchmark'larında bugüne kurulan sabit vakitler
+VAKITLER = [("İmsak", "06:51"), ("Güneş", "08:27"), ("Öğle", "13:19"),
+            ("İkindi", "14:44"), ("Akşam", "17:09"), ("Yatsı", "18:33")]
+
+
+def today_schedule():
+    """VAKITLER'in bugüne kurulmuş PrayerSchedule'ı."""
+    from vakit import PrayerDay, PrayerSchedule, parse_minutes
+    day = PrayerDay(datetime.date.today(), [parse_minutes(t_str) for _, t_str in VAKITLER])
+    return PrayerSchedule.for_day(day)
+
+
+def load_fixture(start=None):
+    """
+    Kaydedilmiş /vakitler/9541 yanıtı (30 gün). start verilirse günler o tarihten
+    başlayacak şekilde yeniden tarihlenir (cache isabetleri için 'bugün' gerekir).
+    """
+    with open(FIXTURE_PATH, "r", encoding="utf-8") as f:
+        days = json.load(f)
+    if start is not None:
+        for i, item in enumerate(days):
+            d = start + datetime.timedelta(days=i)
+            item["MiladiTarihKisa"] = item["MiladiTarihKisaIso8601"] = d.strftime("%d.%m.%Y")
+            item["MiladiTarihUzunIso8601"] = d.isoformat() + "T00:00:00.0000000+03:00"
+    return days
+
+
+def isolate_cache():
+    """Backend'in cache dosyalarını geçici bir klasöre yönlendirir. Klasörü döner."""
+    import backend
+    path = tempfile.mkdtemp(prefix="namazvakti_cache_")
+    backend.CACHE_PATH = os.path.join(path, "prayer_cache.json")
+    backend.CACHE_DB_PATH = os.path.join(path, "prayer_cache.db")
+    backend.LOCATION_INDEX_PATH = os.path.join(path, "location_index.json")
+    return path
+
+
+def seed_cache(district_id=FIXTURE_DISTRICT, start=None):
+    """Fikstürü (bugünden başlayarak) geçici cache'e yazar."""
+    import backend
+    from onbellek import TimetableStore, index_by_date
+    store = TimetableStore(backend.CACHE_DB_PATH)
+    store.put_days(district_id, index_by_date(load_fixture(start or datetime.date.today())))
+    store.touch_district(district_id)
+    store.close()
+
+
+def configure_location(district_id=FIXTURE_DISTRICT):
+    from PyQt6.QtCore import QSettings
+    settings = QSettings("NamazVakti", "Settings")
+    settings.setValue("district_id", district_id)
+    settings.setValue("city_name", "İSTANBUL")
+    settings.setValue("district_name", "İSTANBUL")
+
+
+def isolate_settings():
+    """QSettings'i geçici bir klasöre yönlendirir; kullanıcının ayarlarına dokunulmaz."""
+    from PyQt6.QtCore import QSettings
+    path = tempfile.mkdtemp(prefix="namazvakti_bench_")
+    for fmt in (QSettings.Format.NativeFormat, QSettings.Format.IniFormat):
+        QSettings.setPath(fmt, QSettings.Scope.UserScope, path)
+    return path
+
+
+def make_hud(stop_timer=True):
+    """Konum diyaloğu ve autostart yazımı kapatılmış bir NamazHUD döner."""
+    import main
+    main.NamazHUD.open_location_dialog = lambda self: None
+    main.NamazHUD.create_autostart_entry = lambda self: None
+    hud = main.NamazHUD()
+    if stop_timer:
+        hud.timer.stop()
+    return hud
@@ -0,0 +1,70 @@
+"""
+Toplu vakit hesabı (astronomi.batch_minutes, NumPy): N konum x 365 gün tek seferde,
+gün gün compute_day döngüsüyle karşılaştırmalı. Sonuçların birebir aynı olduğu da
+örneklem üzerinde doğrulanır. Ağ kullanmaz.
+
+    python benchmarks/batch_bench.py [--locations 973] [--year 2027]
+"""
+import sys
+import time
+import random
+import datetime
+import argparse
+
+import _ortak  # noqa: F401  (sys.path)
+from astronomi import batch_minutes, compute_day, VAKIT_ANAHTARLARI, IL_KOORDINATLARI
+
+TURKIYE_ILCE_SAYISI = 973
+
+
+def random_locations(count, seed=42):
+    """İl merkezleri + Türkiye sınırları içinde rastgele noktalar (tekrarlanabilir)."""
+    rng = random.Random(seed)
+    coords = list(IL_KOORDINATLARI.values())[:count]
+    while len(coords) < count:
+        coords.append((rng.uniform(36.0, 42.0), rng.uniform(26.0, 44.8)))
+    return coords
+
+
+def to_minutes(t_str):
+    hour, minute = t_str.split(':')
+    return int(hour) * 60 + int(minute)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--locations", type=int, default=TURKIYE_ILCE_SAYISI)
+    parser.add_argument("--year", type=int, default=datetime.date.today().year + 1)
+    parser.add_argument("--sample", type=int, default=20, help="Skaler döngüyle kıyaslanan konum sayısı")
+    args = parser.parse_args()
+
+    coords = random_locations(args.locations)
+    start = datetime.date(args.year, 1, 1)
+    days = (datetime.date(args.year + 1, 1, 1) - start).days
+    lats = [c[0] for c in coords]
+    lons = [c[1] for c in coords]
+
+    t0 = time.perf_counter()
+    table = batch_minutes(lats, lons, start, days)
+    batch_s = time.perf_counter() - t0
+    print(f"Toplu (NumPy):   {args.locations} konum x {days} gün -> {table.shape}, "
+          f"{table.nbytes / 1024:.0f} KiB, {batch_s:.2f} sn")
+
+    # Skaler yol: örneklem konumlarda gün gün, tüm konumlara oranlanır
+    sample = min(args.sample, args.locations)
+    mismatches = 0
+    t0 = time.perf_counter()
+    for li in range(sample):
+        for di in range(days):
+            item = compute_day(start + datetime.timedelta(days=di), lats[li], lons[li], 3.0)
+            expected = [to_minutes(item[k]) for k in VAKIT_ANAHTARLARI] if item else [-1] * 6
+            if list(table[li, di]) != expected:
+                mismatches += 1
+    scalar_s = (time.perf_counter() - t0) / sample * args.locations
+    print(f"Gün gün (tahmin): {scalar_s:.2f} sn  -> hızlanma {scalar_s / batch_s:.0f}x")
+    print(f"Doğrulama: {sample} konum x {days} gün, {mismatches} farklı gün")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""
+Soğuk başlangıç süresi ve bellek (RSS): veri katmanı (backend) tek başına ile
+eski davranış (backend + modül seviyesinde QtMultimedia + QMediaPlayer kurulumu).
+Her ölçüm ayrı bir Python sürecinde yapılır.
+
+    python benchmarks/cold_start.py [--runs 5]
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = r"""
+import time, resource, json, os, sys
+sys.path.insert(0, {root!r})
+t0 = time.perf_counter()
+{body}
+elapsed = (time.perf_counter() - t0) * 1000
+print(json.dumps({{"ms": elapsed, "rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}}))
+"""
+
+SENARYOLAR = {
+    "Veri katmanı (backend)": """
+from PyQt6.QtCore import QCoreApplication
+app = QCoreApplication([])
+from backend import NamazBackend
+NamazBackend()
+""",
+    "Eski: backend + QtMultimedia": """
+from PyQt6.QtCore import QCoreApplication
+app = QCoreApplication([])
+from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput
+from backend import NamazBackend
+NamazBackend()
+player = QMediaPlayer(); out = QAudioOutput(); player.setAudioOutput(out)
+""",
+    "Ses ilk çalmada (AudioPlayer)": """
+from PyQt6.QtCore import QCoreApplication
+app = QCoreApplication([])
+from ses import AudioPlayer
+AudioPlayer()._ensure_player()
+""",
+}
+
+
+def run_once(body):
+    code = PROBE.format(root=ROOT, body=body)
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=ROOT)
+    if proc.returncode != 0:
+        return None, proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "hata"
+    return json.loads(proc.stdout.strip().splitlines()[-1]), None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    for name, body in SENARYOLAR.items():
+        results = []
+        error = None
+        for _ in range(args.runs):
+            res, error = run_once(body)
+            if res is None:
+                break
+            results.append(res)
+        if not results:
+            print(f"{name:<32} çalıştırılamadı: {error}")
+            continue
+        ms = statistics.median(r["ms"] for r in results)
+        rss = statistics.median(r["rss_kb"] for r in results) / 1024
+        print(f"{name:<32} süre: {ms:7.1f} ms   RSS: {rss:6.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
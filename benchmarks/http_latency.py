@@ -0,0 +1,77 @@
+"""
+Emushaf API gecikme karşılaştırması: her çağrıda yeni bağlantı açan çıplak
+requests.get ile NamazBackend'in havuzlu / koşullu istek yapan oturumu.
+
+Kullanım:
+    python benchmarks/http_latency.py [--district 9541] [--count 10]
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backend import API_BASE, create_session  # noqa: E402
+
+
+def olc(fn, count):
+    sureler = []
+    for _ in range(count):
+        t0 = time.perf_counter()
+        fn()
+        sureler.append((time.perf_counter() - t0) * 1000)
+    return sureler
+
+
+def yazdir(baslik, sureler):
+    sureler = sorted(sureler)
+    p95 = sureler[min(len(sureler) - 1, int(len(sureler) * 0.95))]
+    print(f"{baslik:<38} min: {sureler[0]:7.1f} ms  "
+          f"medyan: {statistics.median(sureler):7.1f} ms  p95: {p95:7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--district", default="9541", help="İlçe ID (varsayılan: İstanbul)")
+    parser.add_argument("--count", type=int, default=10)
+    args = parser.parse_args()
+
+    url = f"{API_BASE}/vakitler/{args.district}"
+
+    # 1. Eski davranış: her çağrıda requests.get (yeni TCP + TLS el sıkışması)
+    bare = olc(lambda: requests.get(url, timeout=10).content, args.count)
+
+    # 2. Havuzlu oturum: bağlantı açık kalır
+    session = create_session()
+    pooled = olc(lambda: session.get(url, timeout=10).content, args.count)
+
+    # 3. Havuzlu oturum + koşullu istek (sunucu destekliyorsa 304)
+    first = session.get(url, timeout=10)
+    headers = {}
+    if first.headers.get("ETag"):
+        headers["If-None-Match"] = first.headers["ETag"]
+    if first.headers.get("Last-Modified"):
+        headers["If-Modified-Since"] = first.headers["Last-Modified"]
+    statuses = []
+
+    def conditional():
+        resp = session.get(url, headers=headers, timeout=10)
+        statuses.append(resp.status_code)
+        return resp.content
+
+    cond = olc(conditional, args.count)
+
+    yazdir("requests.get (bağlantısız)", bare)
+    yazdir("Session (keep-alive)", pooled)
+    yazdir("Session + If-None-Match/Modified", cond)
+    if headers:
+        print(f"Koşullu yanıt kodları: {sorted(set(statuses))} (304 = gövde indirilmedi)")
+    else:
+        print("Sunucu ETag / Last-Modified göndermedi; koşullu istek uygulanamadı.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Bellekteki zaman çizelgesi boyutu: API gün kayıtları sözlüğü (eski) ile kompakt
+dizi tabanlı CompactTimeline karşılaştırması. Dizilerin ham ikili boyutu JSON ile
+kıyaslanır (uygulama diskte SQLite kullanır; ikili biçim sadece ölçüm içindir).
+Ağ kullanmaz (kayıtlı /vakitler fikstüründen türetilmiş sentetik ilçeler).
+
+    python benchmarks/memory_bench.py [--districts 200] [--days 365]
+"""
+import sys
+import json
+import time
+import struct
+import argparse
+import datetime
+import tracemalloc
+from array import array
+
+import _ortak
+from onbellek import index_by_date
+from cizelge import CompactTimeline, SLOTS
+
+_ARRAYS = ("minutes", "h_day", "h_month", "h_year")
+_HEAD = struct.Struct("<iIH")  # başlangıç (ordinal), gün sayısı, ay adları uzunluğu
+
+
+def serialize(timeline):
+    """Zaman çizelgesinin dizileri + Hicri ay adları (makinenin bayt sırasıyla)."""
+    names = "\n".join(f"{m}={name}" for m, name in sorted(timeline.month_names.items())).encode("utf-8")
+    parts = [_HEAD.pack(timeline.start, len(timeline.h_day), len(names)), names]
+    return b"".join(parts + [getattr(timeline, attr).tobytes() for attr in _ARRAYS])
+
+
+def deserialize(data):
+    timeline = CompactTimeline()
+    timeline.start, days, names_len = _HEAD.unpack_from(data, 0)
+    pos = _HEAD.size
+    for line in data[pos:pos + names_len].decode("utf-8").splitlines():
+        month, name = line.split("=", 1)
+        timeline.month_names[int(month)] = name
+    pos += names_len
+    for attr in _ARRAYS:
+        arr = array(getattr(timeline, attr).typecode)
+        size = arr.itemsize * days * (SLOTS if attr == "minutes" else 1)
+        arr.frombytes(data[pos:pos + size])
+        setattr(timeline, attr, arr)
+        pos += size
+    timeline._count = sum(1 for offset in range(days) if timeline.minutes[offset * SLOTS] != 0xFFFF)
+    return timeline
+
+
+def measure(build):
+    """build() sonucunun ayırdığı bellek (bayt) ve sonucu döner."""
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--districts", type=int, default=200)
+    parser.add_argument("--days", type=int, default=365)
+    args = parser.parse_args()
+
+    template = _ortak.load_fixture()[0]
+    today = datetime.date.today()
+    raw = json.dumps(template, ensure_ascii=False)
+
+    def build_dicts():
+        # Her gün ayrı bir sözlük (SQLite'tan json.loads ile okunduğu gibi)
+        timelines = {}
+        for i in range(args.districts):
+            days = []
+            for j in range(args.days):
+                item = json.loads(raw)
+                item["MiladiTarihKisa"] = (today + datetime.timedelta(days=j)).strftime("%d.%m.%Y")
+                days.append(item)
+            timelines[str(100000 + i)] = index_by_date(days)
+        return timelines
+
+    dict_bytes, dicts = measure(build_dicts)
+    compact_bytes, compact = measure(lambda: {d: CompactTimeline.from_days(days) for d, days in dicts.items()})
+    total_days = args.districts * args.days
+    print(f"{args.districts} ilçe x {args.days} gün = {total_days} gün")
+    print(f"Sözlük (API kaydı):  {dict_bytes / 1024 / 1024:8.2f} MiB  ({dict_bytes / total_days:6.0f} B/gün)")
+    print(f"CompactTimeline:     {compact_bytes / 1024 / 1024:8.2f} MiB  ({compact_bytes / total_days:6.0f} B/gün)"
+          f"  -> {dict_bytes / compact_bytes:.0f}x küçük")
+
+    t0 = time.perf_counter()
+    blobs = {d: serialize(t) for d, t in compact.items()}
+    save_ms = (time.perf_counter() - t0) * 1000
+    t0 = time.perf_counter()
+    loaded = {d: deserialize(blob) for d, blob in blobs.items()}
+    load_ms = (time.perf_counter() - t0) * 1000
+    json_size = sum(len(json.dumps(days, ensure_ascii=False).encode("utf-8")) for days in dicts.values())
+    print(f"İkili (diziler):     {sum(map(len, blobs.values())) / 1024:8.0f} KiB  (yaz {save_ms:.1f} ms, "
+          f"oku {load_ms:.1f} ms)  JSON: {json_size / 1024:.0f} KiB")
+
+    sample = next(iter(compact))
+    same = all(loaded[sample].get(d) == compact[sample].get(d) for d in compact[sample])
+    print(f"Doğrulama (ikili -> aynı günler): {'tamam' if same else 'HATA'}")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+"""
+Mikro benchmark'lar: backend ve çizim tarafının sık çalışan yolları.
+Ağ kullanmaz (kayıtlı /vakitler fikstürü + sentetik SQLite cache), ekransız çalışır.
+Sonuçlar JSON olarak kaydedilip başka bir commit'in sonucuyla karşılaştırılabilir.
+
+    python benchmarks/micro.py [--min-time 0.5] [--json sonuc.json] [--compare eski.json]
+    python benchmarks/micro.py --filter cache --districts 200 --months 12
+"""
+import sys
+import json
+import time
+import math
+import platform
+import datetime
+import argparse
+import statistics
+import subprocess
+
+import _ortak
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+
+# --- ÖLÇÜM ---
+def bench(fn, min_time, min_rounds=5, round_ms=2.0):
+    """
+    pytest-benchmark tarzı ölçüm: önce bir turun en az round_ms sürmesi için tur başına
+    çağrı sayısı kalibre edilir, sonra min_time dolana kadar tur atılır.
+    Çağrı başına süreler (µs) ile istatistik döner.
+    """
+    fn()  # Isınma (lazy import, ilk SQLite bağlantısı vs.)
+    iterations = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        elapsed = time.perf_counter() - t0
+        if elapsed * 1000 >= round_ms or iterations >= 1 << 20:
+            break
+        iterations *= 2 if elapsed == 0 else max(2, min(10, math.ceil(round_ms / 1000 / elapsed)))
+
+    samples = []
+    deadline = time.perf_counter() + min_time
+    while len(samples) < min_rounds or time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        samples.append((time.perf_counter() - t0) / iterations * 1e6)
+
+    return {
+        "min_us": min(samples),
+        "median_us": statistics.median(samples),
+        "mean_us": statistics.mean(samples),
+        "stddev_us": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "rounds": len(samples),
+        "iterations": iterations,
+    }
+
+
+# --- SENTETİK VERİ ---
+def synthetic_days(template, start, count):
+    """Fikstür gününden türetilmiş, start'tan itibaren count günlük API listesi."""
+    days = []
+    for i in range(count):
+        d = start + datetime.timedelta(days=i)
+        item = dict(template)
+        item["MiladiTarihKisa"] = item["MiladiTarihKisaIso8601"] = d.strftime("%d.%m.%Y")
+        item["MiladiTarihUzunIso8601"] = d.isoformat() + "T00:00:00.0000000+03:00"
+        days.append(item)
+    return days
+
+
+def seed_synthetic(store, template, districts, months):
+    """districts x months ilçe-ayı (ay = 30 gün) cache'e yazar. İlçe ID'lerini döner."""
+    from onbellek import index_by_date
+    today = datetime.date.today()
+    ids = [str(100000 + i) for i in range(districts)]
+    for district_id in ids:
+        store.put_days(district_id, index_by_date(synthetic_days(template, today, months * 30)))
+        store.touch_district(district_id)
+    return ids
+
+
+# --- SENARYOLAR ---
+def build_cases(args):
+    """(isim, fonksiyon) listesi. Kurulum burada yapılır, ölçülmez."""
+    import backend as backend_mod
+    from backend import NamazBackend
+    from onbellek import TimetableStore, index_by_date
+    from vakit import PrayerSchedule, PrayerDay
+    from arama import DistrictIndex
+    from astronomi import IL_KOORDINATLARI
+
+    today = datetime.date.today()
+    today_str = today.strftime("%d.%m.%Y")
+    fixture = _ortak.load_fixture(today)
+    template = fixture[0]
+
+    _ortak.isolate_cache()
+    _ortak.seed_cache()
+    store = TimetableStore(backend_mod.CACHE_DB_PATH)
+    ids = seed_synthetic(store, template, args.districts, args.months)
+    store.close()
+
+    # Politika sentetik cache'i budamasın: tüm ilçeler ve günler tutulur
+    backend = NamazBackend(max_districts=args.districts + 1, retention_days=1)
+    backend.get_timeline(_ortak.FIXTURE_DISTRICT)
+
+    # Eski find_day_in_list'in yerini alan yol: ilçe zaman çizelgesinde ISO tarih araması
+    big_id = ids[0]
+    big_timeline = backend.get_timeline(big_id)
+    mid_iso = sorted(big_timeline)[len(big_timeline) // 2]
+    big_list = synthetic_days(template, today, args.months * 30)
+    cold_id = ids[-1]
+    month_days = index_by_date(fixture)
+    # Disk yazımı ölçülsün diye senkron store (write-behind'da put_days sadece kuyruğa ekler)
+    sync_store = TimetableStore(backend_mod.CACHE_DB_PATH)
+
+    # Cache açılışı ayrı bir backend üzerinde: ölçülen backend'in store'u değiştirilmez
+    loader = NamazBackend(max_districts=args.districts + 1, retention_days=1)
+    loader.store.close()
+
+    def cache_load():
+        loader.store = TimetableStore(backend_mod.CACHE_DB_PATH, write_delay=backend_mod.WRITE_BEHIND_DELAY)
+        loader.enforce_cache_policy()
+        loader.store.close()
+
+    # İlçe arama: 81 il x 12 ilçe (~Türkiye ilçe sayısı)
+    search_index = DistrictIndex([(str(i * 12 + j), f"{city[:4]}KÖY{j}" if j else city, city, "TÜRKİYE")
+                                  for i, city in enumerate(IL_KOORDINATLARI) for j in range(12)])
+
+    # Ekransız HUD: fikstürün bugünkü vakitleriyle
+    hud = _ortak.make_hud()
+    day = PrayerDay.from_api(template)
+    hud.schedule = PrayerSchedule.for_day(day)
+    hud.show()
+    app = QApplication.instance()
+
+    def update_logic_tick():
+        hud.update_logic()
+        app.processEvents()
+
+    return [
+        ("fetch_cache_hit", lambda: backend.fetch_namaz_times(_ortak.FIXTURE_DISTRICT, today_str)),
+        ("lookup_cached", lambda: backend.lookup_cached(_ortak.FIXTURE_DISTRICT, today_str)),
+        ("timeline_lookup", lambda: backend.get_timeline(big_id).get(mid_iso)),
+        (f"index_by_date_{len(big_list)}", lambda: index_by_date(big_list)),
+        ("location_search", lambda: search_index.search("istanb")),
+        ("prayer_day_from_api", lambda: PrayerDay.from_api(template)),
+        ("cache_load", cache_load),
+        (f"store_load_district_{len(big_timeline)}", lambda: backend.store.load_district(cold_id)),
+        ("store_put_month", lambda: sync_store.put_days(_ortak.FIXTURE_DISTRICT, month_days)),
+        ("merge_days_month", lambda: backend.merge_days(_ortak.FIXTURE_DISTRICT, fixture)),
+        ("update_logic_tick", update_logic_tick),
+    ]
+
+
+# --- ÇIKTI ---
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=_ortak.ROOT, timeout=5)
+        return out.stdout.strip() or None
+    except:
+        return None
+
+
+def print_results(results, baseline=None):
+    header = f"{'Senaryo':<28} {'medyan µs':>11} {'min µs':>11} {'stddev':>9} {'tur':>6}"
+    if baseline:
+        header += f" {'önceki':>11} {'fark':>8}"
+    print(header)
+    for name, r in results.items():
+        line = (f"{name:<28} {r['median_us']:11.2f} {r['min_us']:11.2f} "
+                f"{r['stddev_us']:9.2f} {r['rounds']:6d}")
+        old = (baseline or {}).get(name)
+        if old:
+            change = (r["median_us"] - old["median_us"]) / old["median_us"] * 100
+            line += f" {old['median_us']:11.2f} {change:+7.1f}%"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--min-time", type=float, default=0.5, help="Senaryo başına en az ölçüm süresi (sn)")
+    parser.add_argument("--districts", type=int, default=100, help="Sentetik cache'teki ilçe sayısı")
+    parser.add_argument("--months", type=int, default=24, help="İlçe başına ay (30 gün) sayısı")
+    parser.add_argument("--filter", help="Sadece adında bu metin geçen senaryolar")
+    parser.add_argument("--json", help="Sonuçları bu dosyaya yaz")
+    parser.add_argument("--compare", help="Önceki bir --json çıktısıyla medyanları karşılaştır")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)  # noqa: F841  (HUD ve timer'lar için)
+    _ortak.isolate_settings()
+    cases = build_cases(args)
+
+    results = {}
+    for name, fn in cases:
+        if args.filter and args.filter not in name:
+            continue
+        results[name] = bench(fn, args.min_time)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f).get("results", {})
+    print_results(results, baseline)
+
+    if args.json:
+        meta = {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "district_months": args.districts * args.months,
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
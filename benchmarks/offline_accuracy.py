@@ -0,0 +1,73 @@
+"""
+Çevrimdışı vakit hesabının (astronomi.py) Diyanet verisine göre doğruluğu.
+Kayıtlı fikstür (İstanbul) ve varsa kullanıcının SQLite cache'indeki koordinatı
+bilinen tüm ilçeler karşılaştırılır; her vakit için en büyük fark (dk) raporlanır.
+
+    python benchmarks/offline_accuracy.py [--db ~/.../prayer_cache.db] [--tolerance 1]
+
+Herhangi bir fark toleransı aşarsa 1 ile çıkar.
+"""
+import os
+import sys
+import datetime
+import argparse
+
+import _ortak
+from astronomi import compute_day, VAKIT_ANAHTARLARI, IL_KOORDINATLARI
+from onbellek import TimetableStore, index_by_date
+from yollar import CACHE_DB_PATH
+
+
+def to_minutes(t_str):
+    hour, minute = t_str.split(':')
+    return int(hour) * 60 + int(minute)
+
+
+def compare(days, lat, lon, tz_hours):
+    """{vakit: [fark dk, ...]} - hesaplanan eksi Diyanet."""
+    diffs = {key: [] for key in VAKIT_ANAHTARLARI}
+    for iso_date, item in sorted(days.items()):
+        computed = compute_day(datetime.date.fromisoformat(iso_date), lat, lon, tz_hours)
+        if computed is None:
+            continue
+        for key in VAKIT_ANAHTARLARI:
+            diffs[key].append(to_minutes(computed[key]) - to_minutes(item[key]))
+    return diffs
+
+
+def report(label, diffs, tolerance):
+    worst = {key: max((abs(d) for d in values), default=0) for key, values in diffs.items()}
+    count = len(next(iter(diffs.values())))
+    cells = "  ".join(f"{key} {worst[key]:>2}" for key in VAKIT_ANAHTARLARI)
+    ok = all(w <= tolerance for w in worst.values())
+    print(f"{label:<24} {count:>4} gün  {cells}  {'OK' if ok else 'AŞIM'}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db", default=CACHE_DB_PATH, help="Karşılaştırılacak vakit cache'i (SQLite)")
+    parser.add_argument("--tolerance", type=int, default=1, help="İzin verilen en büyük fark (dk)")
+    args = parser.parse_args()
+
+    print(f"{'Konum':<24} {'':>9}  En büyük fark (dk)")
+    ok = report("İstanbul (fikstür)",
+                compare(index_by_date(_ortak.load_fixture()), *IL_KOORDINATLARI["İSTANBUL"], 3.0),
+                args.tolerance)
+
+    if os.path.exists(args.db):
+        store = TimetableStore(args.db)
+        conn = store._conn()
+        for district_id, lat, lon, tz_hours in conn.execute(
+                "SELECT district_id, enlem, boylam, saat_dilimi FROM ilce_konum ORDER BY district_id"):
+            days = store.load_district(district_id)
+            if days:
+                ok = report(f"İlçe {district_id}", compare(days, lat, lon, tz_hours), args.tolerance) and ok
+        store.close()
+
+    # Koordinat il merkezinin; ilçe merkezi uzaksa fark buna göre değerlendirilmeli
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+sunucu.py yük testi: sunucu ayrı bir süreçte (fikstür cache, ağsız) başlatılır,
+istemci süreçleri keep-alive bağlantılarla belirli süre istek atar.
+
+    python benchmarks/server_load.py [--clients 8] [--duration 5] [--url http://host:port]
+
+--url verilirse çalışan bir sunucu test edilir (fikstür ilçesi 9541 cache'te olmalı).
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+import http.client
+import multiprocessing
+from urllib.parse import urlparse
+
+import _ortak
+
+SERVER_PROBE = r"""
+import sys
+sys.path.insert(0, {here!r})
+import _ortak
+_ortak.isolate_cache()
+_ortak.seed_cache()
+import sunucu
+sunucu.serve("127.0.0.1", 0)
+"""
+
+SENARYOLAR = {
+    "times": ("/times/{d}/today", False),
+    "times (If-None-Match)": ("/times/{d}/today", True),
+    "next": ("/next/{d}", False),
+}
+
+
+def client(args):
+    """Tek bağlantı, süre dolana kadar ardışık istek. (gecikmeler ms, durum sayıları) döner."""
+    host, port, path, conditional, duration = args
+    conn = http.client.HTTPConnection(host, port, timeout=10)
+    headers = {}
+    if conditional:
+        conn.request("GET", path)
+        resp = conn.getresponse()
+        resp.read()
+        headers["If-None-Match"] = resp.getheader("ETag", "")
+    latencies, statuses = [], {}
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        conn.request("GET", path, headers=headers)
+        resp = conn.getresponse()
+        resp.read()
+        latencies.append((time.perf_counter() - t0) * 1000)
+        statuses[resp.status] = statuses.get(resp.status, 0) + 1
+    conn.close()
+    return latencies, statuses
+
+
+def start_server():
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    here = os.path.dirname(os.path.abspath(__file__))
+    proc = subprocess.Popen([sys.executable, "-c", SERVER_PROBE.format(here=here)],
+                            stdout=subprocess.PIPE, text=True, env=env)
+    line = proc.stdout.readline()  # "Dinleniyor: http://127.0.0.1:PORT"
+    if "http://" not in line:
+        proc.kill()
+        raise RuntimeError("Sunucu başlatılamadı")
+    return proc, line.strip().split()[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=8, help="Eşzamanlı istemci süreci")
+    parser.add_argument("--duration", type=float, default=5.0, help="Senaryo başına süre (sn)")
+    parser.add_argument("--url", help="Çalışan bir sunucu (verilmezse yerel olarak başlatılır)")
+    args = parser.parse_args()
+
+    proc = None
+    url = args.url
+    if not url:
+        proc, url = start_server()
+    parsed = urlparse(url)
+
+    try:
+        print(f"{'Senaryo':<24} {'istek/sn':>10} {'p50 ms':>8} {'p99 ms':>8}  durumlar")
+        with multiprocessing.Pool(args.clients) as pool:
+            for name, (path, conditional) in SENARYOLAR.items():
+                jobs = [(parsed.hostname, parsed.port, path.format(d=_ortak.FIXTURE_DISTRICT), conditional,
+                         args.duration)] * args.clients
+                results = pool.map(client, jobs)
+                latencies = sorted(l for lat, _ in results for l in lat)
+                statuses = {}
+                for _, st in results:
+                    for code, n in st.items():
+                        statuses[code] = statuses.get(code, 0) + n
+                p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+                print(f"{name:<24} {len(latencies) / args.duration:10.0f} "
+                      f"{statistics.median(latencies):8.2f} {p99:8.2f}  {statuses}")
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
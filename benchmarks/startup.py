@@ -0,0 +1,174 @@
+"""
+Açılış süresi benchmark'ı: main.py'nin başlatılmasından HUD'un vakitleri
+çizmesine kadar geçen süre, aşamalara bölünmüş olarak. Her tekrar ayrı bir
+Python sürecinde, ekransız (offscreen) ve ağsız (fikstür cache) çalışır.
+
+    python benchmarks/startup.py [--runs 5] [--check] [--json sonuc.json]
+
+Ses (QtMultimedia) ve ağ (requests) modülleri ilk kullanımda yüklendiği için
+ayrı bir süreçte ölçülür; total_to_first_paint'e dahil değildir.
+
+--check: benchmarks/startup_thresholds.json'daki eşiklerden (ms, medyan)
+herhangi biri aşılırsa ya da bu modüller açılışta yüklenirse 1 ile çıkar
+(CI / regresyon kontrolü).
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+THRESHOLDS_PATH = os.path.join(HERE, "startup_thresholds.json")
+
+# Alt süreçte çalışan ölçüm: aşamalar main.py'nin açılış sırasını izler
+PROBE = r"""
+import os, sys, time, json
+t_start = time.perf_counter()
+sys.path.insert(0, {here!r})
+LAZY_MODULES = {lazy!r}
+phases = {{}}
+def lap(name, t0):
+    phases[name] = (time.perf_counter() - t0) * 1000
+    return time.perf_counter()
+
+t = time.perf_counter()
+import _ortak
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QObject, QEvent
+app = QApplication(sys.argv)
+t = lap("import_qtwidgets", t)
+
+_ortak.isolate_settings()
+_ortak.isolate_cache()
+_ortak.seed_cache()
+_ortak.configure_location()
+t = time.perf_counter()
+
+import main
+t = lap("import_app_modules", t)
+
+from backend import NamazBackend
+backend = NamazBackend()
+t = lap("backend_init", t)
+
+backend.get_timeline(_ortak.FIXTURE_DISTRICT)
+t = lap("cache_load", t)
+
+class PaintWatch(QObject):
+    painted = False
+    def eventFilter(self, obj, ev):
+        if ev.type() == QEvent.Type.Paint and hud.schedule is not None:
+            PaintWatch.painted = True
+        return False
+
+t_hud = time.perf_counter()
+hud = _ortak.make_hud(stop_timer=False)
+watch = PaintWatch()
+hud.installEventFilter(watch)
+hud.show()
+deadline = time.perf_counter() + 10
+while not PaintWatch.painted and time.perf_counter() < deadline:
+    app.processEvents()
+lap("hud_first_paint", t_hud)
+phases["total_to_first_paint"] = (time.perf_counter() - t_start) * 1000
+phases["painted"] = PaintWatch.painted
+# Ağ ve ses modülleri ilk kullanımda yüklenir; açılışa sızarlarsa burada görünür
+phases["eager_imports"] = [m for m in LAZY_MODULES if m in sys.modules]
+print(json.dumps(phases))
+"""
+
+# İlk kullanımda yüklenen (açılış süresine girmeyen) modüller, ayrı süreçte ölçülür
+LAZY_MODULES = ("PyQt6.QtMultimedia", "requests")
+LAZY_PROBE = r"""
+import sys, time, json
+from PyQt6.QtWidgets import QApplication
+phases = {}
+for name, module in (("import_qtmultimedia", "PyQt6.QtMultimedia"), ("import_requests", "requests")):
+    t = time.perf_counter()
+    try:
+        __import__(module)
+    except ImportError:
+        continue
+    phases[name] = (time.perf_counter() - t) * 1000
+print(json.dumps(phases))
+"""
+
+
+def _probe(code):
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env)
+    lines = [l for l in proc.stdout.strip().splitlines() if l.startswith("{")]
+    if proc.returncode != 0 or not lines:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "ölçüm başarısız")
+    return json.loads(lines[-1])
+
+
+def run_once():
+    # Her tekrar temiz bir süreç: modül cache'i yok, gerçek açılış gibi.
+    # Tembel modüller ayrı süreçte ölçülür, total_to_first_paint'e girmez.
+    phases = _probe(PROBE.format(here=HERE, lazy=LAZY_MODULES))
+    phases.update(_probe(LAZY_PROBE))
+    return phases
+
+
+def import_breakdown():
+    """python -X importtime ile main.py'nin en pahalı 15 doğrudan / dolaylı importu."""
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                          capture_output=True, text=True, env=env, cwd=os.path.dirname(HERE))
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        own_us, cumulative_us, name = line.replace("import time:", "").split("|")
+        rows.append((int(cumulative_us), int(own_us), name.strip()))
+    rows.sort(reverse=True)
+    return rows[:15]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--check", action="store_true", help="Eşik aşılırsa 1 ile çık")
+    parser.add_argument("--json", help="Medyan sonuçları bu dosyaya yaz")
+    parser.add_argument("--imports", action="store_true", help="-X importtime dökümünü de göster")
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.runs)]
+    phases = [k for k in runs[0] if k not in ("painted", "eager_imports")]
+    medians = {k: statistics.median(r[k] for r in runs if k in r) for k in phases}
+
+    print(f"{'Aşama':<24} {'medyan (ms)':>12}")
+    for k in phases:
+        print(f"{k:<24} {medians[k]:12.1f}")
+    if not all(r["painted"] for r in runs):
+        print("UYARI: bazı tekrarlarda HUD 10 sn içinde vakitleri çizmedi")
+    eager = sorted({m for r in runs for m in r["eager_imports"]})
+    if eager:
+        print(f"UYARI: açılışta yüklenmemesi gereken modüller yüklendi: {', '.join(eager)}")
+
+    if args.imports:
+        print("\nEn pahalı importlar (kümülatif µs / kendi µs):")
+        for cumulative, own, name in import_breakdown():
+            print(f"  {cumulative:>9} {own:>9}  {name}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(medians, f, indent=2)
+
+    if args.check:
+        with open(THRESHOLDS_PATH, "r", encoding="utf-8") as f:
+            thresholds = json.load(f)
+        failed = [(k, medians[k], limit) for k, limit in thresholds.items() if k in medians and medians[k] > limit]
+        for k, value, limit in failed:
+            print(f"REGRESYON: {k} = {value:.1f} ms > eşik {limit} ms")
+        if failed or eager or not all(r["painted"] for r in runs):
+            return 1
+        print("Tüm aşamalar eşiklerin altında.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+NamazHUD.update_logic tik maliyeti: her saniye satırları silip yeniden kuran
+eski yöntem ile kalıcı VakitRow widget'larını güncelleyen yeni yöntem.
+
+Ağ kullanmaz, ekransız (offscreen) çalışır:
+    QT_QPA_PLATFORM=offscreen python benchmarks/tick_bench.py [--ticks 500]
+"""
+import sys
+import time
+import argparse
+import statistics
+
+import _ortak  # offscreen + sys.path
+from PyQt6.QtWidgets import QApplication, QFrame, QHBoxLayout, QLabel, QVBoxLayout  # noqa: E402
+
+
+def legacy_add_row(layout, data, right_text):
+    """Eski add_row: her tikte yeni QFrame + 3 QLabel + 4 stylesheet."""
+    row = QFrame()
+    row.setStyleSheet("QFrame { background: rgba(36, 40, 59, 0.6); border: none; border-radius: 6px; }")
+    row.setFixedHeight(34)
+    lyt = QHBoxLayout(row)
+    lyt.setContentsMargins(8, 0, 8, 0)
+    nm = QLabel(data[0])
+    nm.setStyleSheet("color: #c0caf5; font-weight: bold; font-size: 12px; border:none; background:transparent;")
+    rt = QLabel(right_text)
+    rt.setStyleSheet("color: #9aa5ce; font-size: 10px; font-weight: bold; border:none; background:transparent;")
+    tm = QLabel(data[1])
+    tm.setStyleSheet("color: #c0caf5; font-weight: bold; font-size: 13px; border:none; background:transparent;")
+    lyt.addWidget(nm)
+    lyt.addStretch()
+    lyt.addWidget(rt)
+    lyt.addStretch()
+    lyt.addWidget(tm)
+    layout.addWidget(row)
+
+
+def legacy_tick(layout, tick):
+    while layout.count():
+        child = layout.takeAt(0)
+        if child.widget(): child.widget().deleteLater()
+    for name, t_str in _ortak.VAKITLER:
+        legacy_add_row(layout, (name, t_str), f"1sa {tick % 60}dk {tick % 60}sn kaldı")
+
+
+def olc(app, fn, ticks):
+    sureler = []
+    for i in range(ticks):
+        t0 = time.perf_counter()
+        fn(i)
+        app.processEvents()  # deleteLater / yeniden çizim maliyeti de dahil
+        sureler.append((time.perf_counter() - t0) * 1000)
+    return sureler
+
+
+def yazdir(baslik, sureler):
+    print(f"{baslik:<28} medyan: {statistics.median(sureler):7.3f} ms  "
+          f"ortalama: {statistics.mean(sureler):7.3f} ms  max: {max(sureler):7.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=500)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    _ortak.isolate_settings()
+
+    # Eski yöntem: bağımsız bir pencerede aynı satırları yeniden kur
+    host = QFrame()
+    host.resize(320, 560)
+    legacy_layout = QVBoxLayout(host)
+    host.show()
+    legacy = olc(app, lambda i: legacy_tick(legacy_layout, i), args.ticks)
+    host.close()
+
+    # Yeni yöntem: gerçek HUD, bugünün verisiyle
+    hud = _ortak.make_hud()
+    hud.schedule = _ortak.today_schedule()
+    hud.show()
+    retained = olc(app, lambda i: hud.update_logic(), args.ticks)
+
+    yazdir("Eski (sil + yeniden kur)", legacy)
+    yazdir("Kalıcı satırlar", retained)
+    print(f"Hızlanma (medyan): {statistics.median(legacy) / statistics.median(retained):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
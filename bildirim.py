@@ -0,0 +1,107 @@
+import time
+from PyQt6.QtCore import Qt, QObject, QTimer, pyqtSignal
+
+# =============================================================================
+# BİLDİRİM ZAMANLAYICISI
+# Hatırlatma ve vakit girişi anlarını günün çizelgesinden hesaplar, bir sonraki
+# an için tek atımlık timer kurar. Saniyelik döngüye bağlı değildir.
+# =============================================================================
+
+GRACE_SEC = 5 * 60              # Gecikmiş (uyku, meşgul döngü) olaylar bu süre içinde yine tetiklenir
+WATCHDOG_MS = 60 * 1000         # Askıya alma / saat değişimi sonrası kaçan timer'lara karşı yoklama
+MAX_TIMER_MS = 6 * 3600 * 1000  # Uzun aralıkları böl, saat kaymasına karşı yeniden hesapla
+
+
+class NotificationScheduler(QObject):
+    # (vakit adı, tip) -> tip: "uyari" veya "vakit_girdi"
+    fired = pyqtSignal(str, str)
+    # Gün değişti, yeni günün çizelgesi verilmeli
+    day_rollover = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.schedule = None
+        self.warning_min = 15
+        self.events = []        # [(epoch, vakit adı, tip, vakit epoch)] sıralı
+        self._fired = set()     # (epoch, tip) - aynı olay iki kez tetiklenmesin
+        self._day_end = None    # Çizelgenin ait olduğu günün bitişi (epoch)
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self.check)
+
+        self.watchdog = QTimer(self)
+        self.watchdog.timeout.connect(self.check)
+
+    def set_schedule(self, schedule, warning_min):
+        """Bugünün PrayerSchedule'ını ve hatırlatma süresini (dk) verir, timer'ları kurar."""
+        # Aynı gün yeniden kuruluyorsa (yenileme, "Bugün", ayar kaydı) gecikmiş ama
+        # GRACE_SEC içindeki olaylar eski çizelgeyle önce teslim edilir, yutulmaz.
+        if (schedule is not None and self.schedule is not None and self.events
+                and schedule.date == self.schedule.date):
+            self.check()
+        self.schedule = schedule
+        self.warning_min = warning_min
+        if schedule is None:
+            self.events = []
+            self.timer.stop()
+            self.watchdog.stop()
+            return
+
+        events = []
+        for name, v_ts in zip(schedule.names, schedule.epochs):
+            events.append((v_ts - warning_min * 60, name, "uyari", v_ts))
+            events.append((v_ts, name, "vakit_girdi", v_ts))
+        events.sort()
+        self.events = events
+        self._day_end = _next_midnight(schedule.epochs[0])
+
+        # Çizelge verildiği anda geçmişte kalan olaylar tetiklenmez (açılışta ezan çalmasın);
+        # aynı günün teslim edilmemiş olayları yukarıda check() ile tetiklendi.
+        now = time.time()
+        self._fired = {(ts, tip) for ts, _, tip, _ in events if ts <= now}
+
+        self.watchdog.start(WATCHDOG_MS)
+        self._arm(now)
+
+    def next_event(self):
+        """Sıradaki (epoch, vakit adı, tip) veya None."""
+        for ts, name, tip, _ in self.events:
+            if (ts, tip) not in self._fired:
+                return ts, name, tip
+        return None
+
+    def check(self):
+        """Zamanı gelen olayları tetikler, gecikme penceresini aşanları atlar ve timer'ı yeniden kurar."""
+        now = time.time()
+        for ts, name, tip, v_ts in self.events:
+            if ts > now:
+                break
+            if (ts, tip) in self._fired:
+                continue
+            self._fired.add((ts, tip))
+            late = now - ts
+            # Hatırlatma, vakit girdikten sonra anlamsız
+            if late <= GRACE_SEC and not (tip == "uyari" and now >= v_ts):
+                self.fired.emit(name, tip)
+
+        if self._day_end is not None and now >= self._day_end:
+            self._day_end = None
+            self.day_rollover.emit()
+        self._arm(now)
+
+    def _arm(self, now):
+        upcoming = self.next_event()
+        targets = [t for t in (upcoming[0] if upcoming else None, self._day_end) if t is not None]
+        if not targets:
+            self.timer.stop()
+            return
+        delay_ms = int(max(0.0, min(targets) - now) * 1000) + 1
+        self.timer.start(min(delay_ms, MAX_TIMER_MS))
+
+
+def _next_midnight(ts):
+    """ts'nin ait olduğu yerel günün bitişi (ertesi gece yarısı) epoch olarak."""
+    lt = time.localtime(ts)
+    return time.mktime((lt.tm_year, lt.tm_mon, lt.tm_mday + 1, 0, 0, 0, 0, 0, -1))
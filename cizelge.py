@@ -0,0 +1,160 @@
+import datetime
+import threading
+from array import array
+
+from vakit import PrayerDay, API_ANAHTARLARI, parse_minutes
+
+# =============================================================================
+# KOMPAKT İLÇE ZAMAN ÇİZELGESİ
+# API'nin gün kaydı (~20 metin alanlı sözlük) yerine bellekte sadece uygulamanın
+# okuduğu değerler tutulur: gün başına 6 vakit (gece yarısından itibaren dakika,
+# uint16) ve Hicri tarih (gün / ay / yıl). Gün indeksi = başlangıç gününden fark.
+# Gün başına ~16 bayt; sözlükle ~2-3 KB.
+# =============================================================================
+
+YOK = 0xFFFF  # Cache'te olmayan gün (ilk vakit hücresinde)
+SLOTS = len(API_ANAHTARLARI)
+
+
+def _ordinal(iso_date):
+    return datetime.date.fromisoformat(iso_date).toordinal()
+
+
+class CompactTimeline:
+    """
+    Bir ilçenin ISO tarih -> gün eşlemesi (sözlük gibi: get, in, len, iter, update).
+    get() PrayerDay döner; nesne gün başına bir kez kurulur, gün değişmedikçe aynısı döner.
+    Thread-safe: dizi kaydırma (update / drop_before) ile start değişimi okumalara yarım görünmez.
+    """
+    __slots__ = ("start", "minutes", "h_day", "h_month", "h_year", "month_names", "_count", "_days", "_lock")
+
+    def __init__(self):
+        self.start = 0               # minutes[0:6] gününün ordinal'i
+        self.minutes = array("H")    # gün başına SLOTS hücre
+        self.h_day = array("B")      # Hicri gün (0: bilinmiyor)
+        self.h_month = array("B")
+        self.h_year = array("H")
+        self.month_names = {}        # Hicri ay no -> API'nin yazdığı ad ("Recep")
+        self._count = 0
+        self._days = {}              # ordinal -> PrayerDay (sadece istenen günler)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_days(cls, days):
+        """{ISO tarih: API gün kaydı} sözlüğünden."""
+        timeline = cls()
+        timeline.update(days)
+        return timeline
+
+    def __len__(self):
+        return self._count
+
+    def _offset(self, iso_date):
+        try:
+            offset = _ordinal(iso_date) - self.start
+        except (TypeError, ValueError):
+            return None
+        if 0 <= offset < len(self.h_day) and self.minutes[offset * SLOTS] != YOK:
+            return offset
+        return None
+
+    def __contains__(self, iso_date):
+        with self._lock:
+            return self._offset(iso_date) is not None
+
+    def __iter__(self):
+        """Cache'teki günlerin ISO tarihleri (sıralı)."""
+        with self._lock:
+            start, minutes = self.start, self.minutes[:]
+        for offset in range(len(minutes) // SLOTS):
+            if minutes[offset * SLOTS] != YOK:
+                yield datetime.date.fromordinal(start + offset).isoformat()
+
+    def get(self, iso_date, default=None):
+        if not iso_date:
+            return default
+        with self._lock:
+            offset = self._offset(iso_date)
+            if offset is None:
+                return default
+            ordinal = self.start + offset
+            day = self._days.get(ordinal)
+            if day is None:
+                base = offset * SLOTS
+                month = self.h_month[offset]
+                day = PrayerDay(datetime.date.fromordinal(ordinal), self.minutes[base:base + SLOTS],
+                                (self.h_day[offset], month, self.h_year[offset]), self.month_names.get(month, ""))
+                self._days[ordinal] = day
+            return day
+
+    def _grow(self, first, last):
+        """Dizileri [first, last] ordinal aralığını kapsayacak şekilde boş günlerle genişletir."""
+        length = len(self.h_day)
+        if not length:
+            self.start = first
+        before = max(0, self.start - first)
+        after = max(0, last - (self.start + length - 1))
+        if before:
+            self.minutes[0:0] = array("H", [YOK]) * (before * SLOTS)
+            self.h_day[0:0] = array("B", bytes(before))
+            self.h_month[0:0] = array("B", bytes(before))
+            self.h_year[0:0] = array("H", [0]) * before
+            self.start -= before
+        if after:
+            self.minutes.extend(array("H", [YOK]) * (after * SLOTS))
+            self.h_day.extend(bytes(after))
+            self.h_month.extend(bytes(after))
+            self.h_year.extend(array("H", [0]) * after)
+
+    def update(self, days):
+        """{ISO tarih: API gün kaydı} ekler / günceller. Vakitleri okunamayan günler atlanır."""
+        rows = []
+        for iso_date, item in days.items():
+            values = [parse_minutes(item.get(key, "")) for key in API_ANAHTARLARI]
+            if None in values:
+                continue
+            try:
+                rows.append((_ordinal(iso_date), values, item))
+            except (TypeError, ValueError):
+                continue
+        if not rows:
+            return
+        with self._lock:
+            self._grow(min(r[0] for r in rows), max(r[0] for r in rows))
+            for ordinal, values, item in rows:
+                offset = ordinal - self.start
+                base = offset * SLOTS
+                if self.minutes[base] == YOK:
+                    self._count += 1
+                self.minutes[base:base + SLOTS] = array("H", values)
+                self._set_hijri(offset, item)
+                self._days.pop(ordinal, None)
+
+    def _set_hijri(self, offset, item):
+        try:
+            day, month, year = (int(p) for p in item["HicriTarihKisa"].split('.'))
+            if not (1 <= day <= 30 and 1 <= month <= 12):
+                raise ValueError
+        except:
+            day = month = year = 0
+        self.h_day[offset], self.h_month[offset], self.h_year[offset] = day, month, year
+        if day and month not in self.month_names:
+            parts = (item.get("HicriTarihUzun") or "").split()
+            if len(parts) >= 3:
+                self.month_names[month] = " ".join(parts[1:-1])
+
+    def drop_before(self, iso_date):
+        """Verilen tarihten eski günleri atar."""
+        with self._lock:
+            cut = min(max(0, _ordinal(iso_date) - self.start), len(self.h_day))
+            if not cut:
+                return
+            dropped = sum(1 for offset in range(cut) if self.minutes[offset * SLOTS] != YOK)
+            del self.minutes[:cut * SLOTS]
+            del self.h_day[:cut]
+            del self.h_month[:cut]
+            del self.h_year[:cut]
+            self.start += cut
+            self._count -= dropped
+            for ordinal in [o for o in self._days if o < self.start]:
+                del self._days[ordinal]
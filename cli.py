@@ -0,0 +1,180 @@
+"""
+Namaz Vakti komut satırı aracı (GUI'siz). Backend'in cache + API mantığını kullanır,
+PyQt6 widget'larını yüklemez; betikler ve durum çubukları (waybar, polybar, conky) için.
+
+Örnekler:
+    python cli.py today
+    python cli.py next --format json
+    python cli.py range --days 7 --district 9541
+    python cli.py daemon --format json      # her dakika bir satır (waybar "exec" için)
+    python cli.py warm --districts 9541,9206,9560 --rate 2   # birden çok ilçenin cache'ini ısıt
+"""
+import sys
+import json
+import time
+import argparse
+import datetime
+
+from backend import NamazBackend
+from vakit import PrayerSchedule
+
+
+def saved_district():
+    """GUI'nin kayıtlı konumu (QSettings; sadece QtCore kullanılır)."""
+    from PyQt6.QtCore import QSettings
+    settings = QSettings("NamazVakti", "Settings")
+    return settings.value("district_id"), settings.value("city_name", ""), settings.value("district_name", "")
+
+
+def fetch_day(backend, district_id, date):
+    """Günün PrayerDay'i; alınamazsa RuntimeError."""
+    day, error = backend.fetch_namaz_times(district_id, date.strftime("%d.%m.%Y"))
+    if error:
+        raise RuntimeError(error)
+    return day
+
+
+def get_day(backend, district_id, date):
+    return day_info(fetch_day(backend, district_id, date))
+
+
+def day_info(day):
+    """PrayerDay -> JSON'a yazılabilir sözlük (komut satırı ve HTTP servisi çıktısı)."""
+    return {
+        "date": day.date.isoformat(),
+        "hijri": day.hijri_text,
+        "times": dict(day.vakitler),
+        "computed": day.computed,  # API yerine koordinattan hesaplandı
+        "stale": day.stale,        # Eski cache verisi, arka planda yenileniyor
+    }
+
+
+def next_prayer(backend, district_id, now=None):
+    """Sıradaki vakit: {"name", "time", "date", "remaining_sec"}. Yatsıdan sonra ertesi günün İmsak'ı."""
+    now = now or time.time()
+    today = datetime.date.fromtimestamp(now)
+    for date in (today, today + datetime.timedelta(days=1)):
+        sched = PrayerSchedule.for_day(fetch_day(backend, district_id, date))
+        idx = sched.next_index(now)
+        if idx < len(sched):
+            return {
+                "name": sched.names[idx],
+                "time": sched.labels[idx],
+                "date": date.isoformat(),
+                "remaining_sec": int(sched.epochs[idx] - now),
+            }
+    raise RuntimeError("Sıradaki vakit bulunamadı")
+
+
+def format_remaining(seconds):
+    h, rem = divmod(max(0, seconds), 3600)
+    m = rem // 60
+    return f"{h}sa {m}dk" if h else f"{m}dk"
+
+
+def print_days(days, fmt, single=False):
+    if fmt == "json":
+        print(json.dumps(days[0] if single else days, ensure_ascii=False))
+        return
+    for day in days:
+        print(f"{day['date']}  {day['hijri']}" + ("  (hesaplanan)" if day["computed"] else ""))
+        for name, t_str in day["times"].items():
+            print(f"  {name:<7} {t_str}")
+
+
+def print_next(info, fmt):
+    text = f"{info['name']} {info['time']} ({format_remaining(info['remaining_sec'])})"
+    if fmt == "json":
+        # "text" / "tooltip" alanları waybar custom modülüyle doğrudan uyumlu
+        out = dict(info, text=text, tooltip=f"{info['name']} vaktine {format_remaining(info['remaining_sec'])} kaldı")
+        print(json.dumps(out, ensure_ascii=False), flush=True)
+    else:
+        print(text, flush=True)
+
+
+def run_daemon(backend, district_id, fmt, interval):
+    """Her interval saniyede (dakika başına hizalı) sıradaki vakti yazar; Ctrl+C ile çıkılır."""
+    while True:
+        try:
+            print_next(next_prayer(backend, district_id), fmt)
+        except RuntimeError as e:
+            print(json.dumps({"text": "?", "error": str(e)}, ensure_ascii=False) if fmt == "json" else f"Hata: {e}",
+                  flush=True)
+        now = time.time()
+        time.sleep(interval - (now % interval) + 0.05)
+
+
+def run_warm(args):
+    """Verilen ilçelerin 30 günlük penceresini eşzamanlı çekip cache'e yazar."""
+    district_ids = [d.strip() for d in (args.districts or args.district or "").split(",") if d.strip()]
+    if not district_ids:
+        print("warm için --districts <ID,ID,...> verin.", file=sys.stderr)
+        return 2
+    backend = NamazBackend()
+    backend.set_rate_limit(args.rate)
+    # Isıtılan ilçeler saklama politikası yüzünden hemen silinmesin
+    backend.set_cache_policy(max_districts=max(backend.max_districts, len(district_ids)))
+    results = backend.fetch_many(district_ids, max_workers=args.workers)
+    if args.format == "json":
+        print(json.dumps({d: {"days": len(days or {}), "error": error} for d, (days, error) in results.items()},
+                         ensure_ascii=False))
+    else:
+        for district_id, (days, error) in results.items():
+            print(f"{district_id:<8} " + (f"Hata: {error}" if error else f"{len(days)} gün"))
+    return 1 if any(error for _, error in results.values()) else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="namazvakti", description="Namaz vakitleri (komut satırı)")
+    parser.add_argument("command", nargs="?", default="today", choices=["today", "next", "range", "daemon", "warm"])
+    parser.add_argument("--district", help="İlçe ID (varsayılan: GUI'de seçili konum)")
+    parser.add_argument("--format", choices=["plain", "json"], default="plain")
+    parser.add_argument("--date", help="Başlangıç tarihi (dd.MM.yyyy, varsayılan: bugün)")
+    parser.add_argument("--days", type=int, default=7, help="range için gün sayısı")
+    parser.add_argument("--interval", type=int, default=60, help="daemon güncelleme aralığı (sn)")
+    parser.add_argument("--districts", help="warm için virgülle ayrılmış ilçe ID'leri")
+    parser.add_argument("--workers", type=int, default=4, help="warm için eşzamanlı istek sayısı")
+    parser.add_argument("--rate", type=float, default=4.0, help="warm için saniyede en fazla istek")
+    parser.add_argument("--lat", type=float, help="Çevrimdışı hesap için enlem (ilçe için kaydedilir)")
+    parser.add_argument("--lon", type=float, help="Çevrimdışı hesap için boylam")
+    args = parser.parse_args(argv)
+
+    if args.command == "warm":
+        return run_warm(args)
+
+    district_id = args.district or saved_district()[0]
+    if not district_id:
+        print("Konum seçilmemiş: --district <İlçe ID> verin veya GUI'den konum seçin.", file=sys.stderr)
+        return 2
+
+    start = datetime.date.today()
+    if args.date:
+        try:
+            start = datetime.datetime.strptime(args.date, "%d.%m.%Y").date()
+        except ValueError:
+            print("Tarih formatı hatası (dd.MM.yyyy)", file=sys.stderr)
+            return 2
+
+    backend = NamazBackend()
+    if args.lat is not None and args.lon is not None:
+        backend.set_coordinates(district_id, args.lat, args.lon)
+    try:
+        if args.command == "today":
+            print_days([get_day(backend, district_id, start)], args.format, single=True)
+        elif args.command == "range":
+            days = [get_day(backend, district_id, start + datetime.timedelta(days=i)) for i in range(args.days)]
+            print_days(days, args.format)
+        elif args.command == "next":
+            print_next(next_prayer(backend, district_id), args.format)
+        else:
+            run_daemon(backend, district_id, args.format, max(1, args.interval))
+    except RuntimeError as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
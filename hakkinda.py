@@ -1,5 +1,4 @@
 import os
-import requests
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                              QPushButton, QFrame, QTextBrowser, QMessageBox,
                              QStyle, QApplication, QGraphicsDropShadowEffect)
@@ -21,6 +20,7 @@ class UpdateWorker(QThread):
     def run(self):
         result = {"status": "error", "data": None}
         try:
+            import requests  # Sadece güncelleme kontrolünde gerekir, açılışı yavaşlatmasın
             url = f"https://api.github.com/repos/{self.user}/{self.repo}/releases/latest"
             response = requests.get(url, timeout=5)
             if response.status_code == 200:
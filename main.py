@@ -1,4 +1,5 @@
 import sys
+import time
 import datetime
 import os
 from PyQt6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout,
@@ -11,6 +12,10 @@ from PyQt6.QtGui import QIcon, QAction, QTextCharFormat, QColor, QFont, QBrush
 from tasarim import LocationDialog, AyarlarDialog, LOGO_PATH
 from hakkinda import HakkindaDialog
 from backend import NamazBackend
+from ses import AudioPlayer
+from vakit import PrayerSchedule
+from bildirim import NotificationScheduler
+from astronomi import city_coordinates
 
 # =============================================================================
 # NAMAZ VAKTİ HUD v1.0
@@ -170,6 +175,57 @@ class CalendarDialog(QDialog):
         return self.calendar.selectedDate()
 
 
+# --- VAKİT SATIRI (KALICI WIDGET) ---
+class VakitRow(QFrame):
+    """
+    Tek bir vakit satırı. Bir kez oluşturulur; her saniye sadece değişen metin
+    güncellenir, stil sadece durum (normal / vaktindeyiz / geçmiş) değişince yeniden verilir.
+    """
+    STYLES = {
+        "normal": ("background: rgba(36, 40, 59, 0.6); border: none;", "#9aa5ce", "#c0caf5", "#c0caf5"),
+        "highlight": ("background: rgba(16, 185, 129, 0.15); border: 1px solid #10b981;", "#10b981", "#10b981", "#10b981"),
+        "past": ("background: rgba(255, 255, 255, 0.02); border: none;", "#414868", "#565f89", "#565f89"),
+    }
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.state = None
+        self.setFixedHeight(34)
+        lyt = QHBoxLayout(self)
+        lyt.setContentsMargins(8, 0, 8, 0)
+
+        self.nm = QLabel()
+        self.rt = QLabel()
+        self.tm = QLabel()
+
+        lyt.addWidget(self.nm)
+        lyt.addStretch()
+        lyt.addWidget(self.rt)
+        lyt.addStretch()
+        lyt.addWidget(self.tm)
+
+    def update_row(self, data, right_text, highlight, is_past):
+        state = "highlight" if highlight else ("past" if is_past else "normal")
+        if state != self.state:
+            self.state = state
+            style, txt_color, name_color, time_color = self.STYLES[state]
+            self.setStyleSheet(f"QFrame {{ {style} border-radius: 6px; }}")
+            self.nm.setStyleSheet(
+                f"color: {name_color}; font-weight: bold; font-size: 12px; border:none; background:transparent;")
+            if highlight:
+                self.rt.setStyleSheet("color: #ffffff; font-weight: 900; font-size: 11px; border:none; background:transparent;")
+            else:
+                self.rt.setStyleSheet(
+                    f"color: {txt_color}; font-size: 10px; font-weight: bold; border:none; background:transparent;")
+            self.tm.setStyleSheet(
+                f"color: {time_color}; font-weight: bold; font-size: 13px; border:none; background:transparent;")
+
+        # QLabel.setText aynı metinde de yeniden yerleşim yapar, sadece değişince çağır
+        if self.nm.text() != data[0]: self.nm.setText(data[0])
+        if self.rt.text() != right_text: self.rt.setText(right_text)
+        if self.tm.text() != data[1]: self.tm.setText(data[1])
+
+
 class NamazHUD(QWidget):
     def __init__(self):
         super().__init__()
@@ -178,24 +234,34 @@ class NamazHUD(QWidget):
         self.view_date = QDate.currentDate()
         self.m_pos = None # X11 taşıma için
 
-        # Backend
-        self.backend = NamazBackend()
+        # Backend (Cache sınırları kiosk kurulumları için ayar dosyasından değiştirilebilir)
+        self.backend = NamazBackend(
+            max_districts=self.settings.value("cache_max_districts", 16, type=int),
+            retention_days=self.settings.value("cache_retention_days", 31, type=int))
+        self.backend.times_ready.connect(self.on_times_ready)
 
         self.load_app_settings()
 
-        self.vakitler = []
-        self.hijri_date = None
+        # Ses: QtMultimedia ilk çalmada yüklenir, ses kapalıysa hiç yüklenmez
+        self.audio = AudioPlayer(self)
+
+        self.schedule = None  # Günün önceden parse edilmiş çizelgesi (PrayerSchedule)
+        self.prayer_day = None  # Gösterilen günün vakitleri ve Hicri tarihi (PrayerDay)
         self.current_city = "Yükleniyor..."
         self.is_ramadan = False
-        self.ramadan_times = {}
 
         self.app_icon = QIcon(LOGO_PATH)
         self.setWindowIcon(self.app_icon)
 
         self.init_ui()
-        self.backend.stop_btn_ref = self.btn_stop_sound
+        self.audio.stop_btn_ref = self.btn_stop_sound
 
         self.init_tray()
+
+        # Bildirimler: saniyelik döngüden bağımsız, vakit anlarına kurulan tek atımlık timer'lar
+        self.notifier = NotificationScheduler(self)
+        self.notifier.fired.connect(self.bildir)
+        self.notifier.day_rollover.connect(self.on_day_rollover)
         
         # İlk açılışta konum kontrolü
         if not self.settings.value("district_id"):
@@ -205,7 +271,8 @@ class NamazHUD(QWidget):
             
         self.create_autostart_entry()
 
-        self.timer = QTimer()
+        # Saniyelik çizim döngüsü sadece pencere görünürken çalışır (bkz. showEvent / hideEvent)
+        self.timer = QTimer(self)
         self.timer.timeout.connect(self.update_logic)
         self.timer.start(1000)
 
@@ -309,6 +376,12 @@ class NamazHUD(QWidget):
         # --- VAKİTLER ---
         self.vakit_area = QVBoxLayout()
         self.vakit_area.setSpacing(4)
+        self.vakit_rows = []
+        for _ in range(6):
+            row = VakitRow()
+            row.hide()
+            self.vakit_rows.append(row)
+            self.vakit_area.addWidget(row)
         ui_layout.addLayout(self.vakit_area)
 
         # --- BİLGİ ALANI ---
@@ -352,7 +425,7 @@ class NamazHUD(QWidget):
         # --- ALT KISIM ---
         self.btn_stop_sound = QPushButton("Sesi Sustur 🔇")
         self.btn_stop_sound.hide()
-        self.btn_stop_sound.clicked.connect(self.backend.stop_sound)
+        self.btn_stop_sound.clicked.connect(self.audio.stop_sound)
         self.btn_stop_sound.setStyleSheet("""
             QPushButton { background-color: #f7768e; color: white; border-radius: 6px; font-weight: bold; font-size: 12px; padding: 8px; border:none; }
             QPushButton:hover { background-color: #ff9eaf; }
@@ -383,6 +456,10 @@ class NamazHUD(QWidget):
         dlg = AyarlarDialog(self, self.settings)
         if dlg.exec():
             self.load_app_settings()
+            if not self.ses_aktif:
+                self.audio.unload()
+            if self.notifier.schedule:
+                self.notifier.set_schedule(self.notifier.schedule, self.uyari_dk)
             self.fetch_data()
 
     def open_calendar(self):
@@ -403,7 +480,6 @@ class NamazHUD(QWidget):
 
     def fetch_data(self):
         self.btn_date_display.setText(self.view_date.toString("dd.MM.yyyy"))
-        QApplication.processEvents()
 
         # Ayarlardan Konum ID'sini al (Diyanet ID)
         district_id = self.settings.value("district_id")
@@ -411,43 +487,72 @@ class NamazHUD(QWidget):
         district_name = self.settings.value("district_name", "")
 
         if not district_id:
+            self.backend.cancel_pending()
             self.current_city = "Konum Seçiniz"
             self.lbl_loc.setText(self.current_city)
             return
 
         self.current_city = f"{city_name} / {district_name}"
-        
+        self.lbl_loc.setText("Yükleniyor...")
+        coords = self.location_coordinates(city_name)
+        if coords:
+            self.backend.set_coordinates(district_id, *coords)
+        self.backend.set_prefetch_district(district_id)
+
         # Backend'e tarih stringi gönder (API formatı: dd.MM.yyyy)
+        # Sonuç on_times_ready ile gelir, GUI thread'i ağ isteğini beklemez.
         date_str = self.view_date.toString("dd.MM.yyyy")
-        data, error = self.backend.fetch_namaz_times(district_id, date_str)
+        self.backend.fetch_namaz_times_async(district_id, date_str)
 
+    def location_coordinates(self, city_name):
+        """Ayarlardaki (enlem, boylam); yoksa il merkezinin koordinatı. Bilinmiyorsa None."""
+        try:
+            lat = self.settings.value("latitude", type=float)
+            lon = self.settings.value("longitude", type=float)
+            if lat or lon:
+                return lat, lon
+        except:
+            pass
+        return city_coordinates(city_name)
+
+    def on_times_ready(self, request_id, data, error):
         if error:
             self.lbl_loc.setText("İnternet/Veri Hatası")
             return
 
-        self.lbl_loc.setText(f"{self.current_city}")
-        t = data['timings']
-        self.hijri_date = data['date']['hijri']
-
-        # Diyanet verisi olduğu için artık offset/düzeltme yok.
-        # Doğrudan veriyi kullanıyoruz.
-        self.vakitler = [
-            ("İmsak", t["Fajr"]),
-            ("Güneş", t["Sunrise"]),
-            ("Öğle", t["Dhuhr"]),
-            ("İkindi", t["Asr"]),
-            ("Akşam", t["Maghrib"]),
-            ("Yatsı", t["Isha"])
-        ]
-        
-        self.ramadan_times = {
-            "imsak": t["Fajr"], 
-            "aksam": t["Maghrib"]
-        }
+        # Ağ ve cache yoksa vakitler koordinattan hesaplanmıştır, kullanıcı bilsin
+        if data.computed:
+            self.lbl_loc.setText(f"{self.current_city} (hesaplanan)")
+            self.lbl_loc.setToolTip("Diyanet verisine ulaşılamadı, vakitler konumdan hesaplandı (±1 dk).")
+        else:
+            self.lbl_loc.setText(f"{self.current_city}")
+            # Eski cache verisi: gösterilir, backend arka planda yeniler
+            self.lbl_loc.setToolTip("Önbellekteki veri gösteriliyor, arka planda güncelleniyor."
+                                    if data.stale else "")
+        # Diyanet verisi olduğu için artık offset/düzeltme yok, doğrudan kullanılır.
+        self.prayer_day = data
+        self.schedule = PrayerSchedule.for_day(data)
+        if self.schedule.date == datetime.date.today():
+            self.notifier.set_schedule(self.schedule, self.uyari_dk)
         self.update_special_days_info()
+        self.update_logic()
+
+    def on_day_rollover(self):
+        """Gece yarısı: bugünü gösteriyorsak yeni güne geç, bildirimleri yeni günün vakitlerine kur."""
+        yesterday = QDate.currentDate().addDays(-1)
+        if self.view_date == yesterday:
+            self.refresh_today()
+            return
+        district_id = self.settings.value("district_id")
+        data = self.backend.lookup_cached(district_id, QDate.currentDate().toString("dd.MM.yyyy")) if district_id else None
+        if data:
+            self.notifier.set_schedule(PrayerSchedule.for_day(data), self.uyari_dk)
+        elif district_id:
+            # Bugün cache'te yok: başka gün görüntüleniyor olsa da bildirimler için bugünü getir
+            self.refresh_today()
 
     def update_special_days_info(self):
-        if not self.hijri_date: return
+        if not self.prayer_day: return
 
         # 1. HİCRİ AY HESAPLAMA (2026 Excel'e göre)
         d = self.view_date
@@ -471,12 +576,10 @@ class NamazHUD(QWidget):
             elif current_date < datetime.date(2026, 11, 11): ay_adi = "Cemaziyelevvel"
             else: ay_adi = "Cemaziyelahir"
         else:
-            # Emushaf API hicri tarihi bazen veriyor bazen vermiyor, 
-            # ancak biz backend'de basic bir map yaptık.
-            h_month = self.hijri_date['month']
-            # Eğer API ay ismini metin olarak verdiyse onu kullan, yoksa sayıdan bul
-            if isinstance(h_month, dict) and h_month.get("en"):
-                ay_adi = h_month.get("en")
+            # Emushaf API hicri tarihi bazen veriyor bazen vermiyor
+            # Eğer API ay ismini verdiyse onu kullan
+            if self.prayer_day.hijri_month_name:
+                ay_adi = self.prayer_day.hijri_month_name
             else:
                 # Yedek (Basit Liste)
                 ay_adi = "Hicri Takvim"
@@ -510,44 +613,36 @@ class NamazHUD(QWidget):
         self.is_ramadan = (ay_adi == "Ramazan")
         if self.is_ramadan:
             self.ramadan_times_frame.show()
-            self.lbl_sahur_time.setText(f"Sahur: {self.ramadan_times.get('imsak')}")
-            self.lbl_iftar_time.setText(f"İftar: {self.ramadan_times.get('aksam')}")
+            self.lbl_sahur_time.setText(f"Sahur: {self.prayer_day.imsak}")
+            self.lbl_iftar_time.setText(f"İftar: {self.prayer_day.aksam}")
         else:
             self.ramadan_times_frame.hide()
             self.lbl_ramadan_timer.hide()
 
     def update_logic(self):
-        if not self.vakitler: return
-        now = datetime.datetime.now()
-        is_today = (self.view_date == QDate.currentDate())
-
-        self.clear_layout(self.vakit_area)
-        next_idx = 0
+        sched = self.schedule
+        if not sched: return
+        now = time.time()
+        is_today = (sched.date == datetime.date.today())
 
         if is_today:
-            for i, (name, t_str) in enumerate(self.vakitler):
-                v_dt = datetime.datetime.combine(now.date(), datetime.datetime.strptime(t_str, "%H:%M").time())
-                if v_dt > now:
-                    next_idx = i
-                    break
-                if i == 5 and v_dt < now: next_idx = 0
-
-            yatsi_time = datetime.datetime.combine(now.date(),
-                                                   datetime.datetime.strptime(self.vakitler[5][1], "%H:%M").time())
-            start_idx = 5 if now > yatsi_time else max(0, next_idx - 1)
+            # Sıradaki vakit: bisect ile; Yatsı da geçtiyse ertesi günün İmsak'ı (0)
+            passed_count = sched.next_index(now)
+            next_idx = passed_count if passed_count < len(sched) else 0
+            start_idx = 5 if passed_count == len(sched) else max(0, next_idx - 1)
         else:
             start_idx = 0
-            next_idx = -1
 
-        display_list = self.vakitler[start_idx:] if is_today else self.vakitler
+        # Listede gösterilmeyen (geçmiş) satırları gizle, widget'lar silinmez
+        for row in self.vakit_rows[:start_idx]:
+            if not row.isHidden(): row.hide()
 
-        for i, (name, t_str) in enumerate(display_list):
-            original_idx = start_idx + i if is_today else i
-            v_dt = datetime.datetime.combine(now.date(), datetime.datetime.strptime(t_str, "%H:%M").time())
-            is_passed = (v_dt < now) if is_today else False
-            is_next = (original_idx == next_idx) and not is_passed and is_today
+        for original_idx in range(start_idx, len(sched)):
+            name = sched.names[original_idx]
+            t_str = sched.labels[original_idx]
+            v_ts = sched.epochs[original_idx]
+            is_passed = (v_ts < now) if is_today else False
 
-            h, m, s = 0, 0, 0
             right_text = ""
             is_highlighted = False
 
@@ -556,8 +651,7 @@ class NamazHUD(QWidget):
                     right_text = "Vaktindeyiz !!"
                     is_highlighted = True
                 else:
-                    diff = v_dt - now
-                    total_sec = int(diff.total_seconds())
+                    total_sec = int(v_ts - now)
                     h, rem = divmod(total_sec, 3600)
                     m, s = divmod(rem, 60)
 
@@ -568,58 +662,31 @@ class NamazHUD(QWidget):
                     right_text = f"{time_str} kaldı"
                     is_highlighted = False
 
-            self.add_row((name, t_str), right_text, is_highlighted, is_passed)
-
-            if is_next and is_today:
-                if h == 0 and m == self.uyari_dk and s == 0: self.bildir(name, "uyari")
-                if h == 0 and m == 0 and s == 0: self.bildir(name, "vakit_girdi")
+            row = self.vakit_rows[original_idx]
+            row.update_row((name, t_str), right_text, is_highlighted, is_passed)
+            if row.isHidden(): row.show()
 
         if self.is_ramadan and is_today: self.update_ramadan_timer(now)
-
-    def add_row(self, data, right_text, highlight, is_past):
-        row = QFrame()
-        style = "background: rgba(36, 40, 59, 0.6); border: none;"
-        txt_color = "#9aa5ce"
-        name_color = "#c0caf5"
-        time_color = "#c0caf5"
-
-        if highlight:
-            style = "background: rgba(16, 185, 129, 0.15); border: 1px solid #10b981;"
-            txt_color = "#10b981"
-            name_color = "#10b981"
-            time_color = "#10b981"
-        elif is_past:
-            style = "background: rgba(255, 255, 255, 0.02); border: none;"
-            txt_color = "#414868"
-            name_color = "#565f89"
-            time_color = "#565f89"
-
-        row.setStyleSheet(f"QFrame {{ {style} border-radius: 6px; }}")
-        row.setFixedHeight(34)
-        lyt = QHBoxLayout(row)
-        lyt.setContentsMargins(8, 0, 8, 0)
-
-        nm = QLabel(data[0])
-        nm.setStyleSheet(
-            f"color: {name_color}; font-weight: bold; font-size: 12px; border:none; background:transparent;")
-
-        rt = QLabel(right_text)
-        if right_text == "Vaktindeyiz !!":
-            rt.setStyleSheet("color: #ffffff; font-weight: 900; font-size: 11px; border:none; background:transparent;")
+        elif not self.lbl_ramadan_timer.isHidden(): self.lbl_ramadan_timer.hide()
+
+    def update_ramadan_timer(self, now):
+        """Ramazan'da iftara (Akşam) veya sahura (İmsak) kalan süreyi gösterir."""
+        sched = self.schedule
+        imsak_ts, aksam_ts = sched.epochs[0], sched.epochs[4]
+        if imsak_ts <= now < aksam_ts:
+            label, target = "İftara", aksam_ts
         else:
-            rt.setStyleSheet(
-                f"color: {txt_color}; font-size: 10px; font-weight: bold; border:none; background:transparent;")
-
-        tm = QLabel(data[1])
-        tm.setStyleSheet(
-            f"color: {time_color}; font-weight: bold; font-size: 13px; border:none; background:transparent;")
-
-        lyt.addWidget(nm)
-        lyt.addStretch()
-        lyt.addWidget(rt)
-        lyt.addStretch()
-        lyt.addWidget(tm)
-        self.vakit_area.addWidget(row)
+            # Akşamdan sonra ertesi günün imsakı: bugünkü imsak + 1 gün (dakika farkı ihmal)
+            label, target = "Sahura", imsak_ts if now < imsak_ts else imsak_ts + 86400
+        h, rem = divmod(int(target - now), 3600)
+        m, s = divmod(rem, 60)
+        text = f"{label} {h}sa {m}dk {s}sn kaldı"
+        if self.lbl_ramadan_timer.text() != text:
+            self.lbl_ramadan_timer.setText(text)
+        if self.lbl_ramadan_timer.isHidden():
+            self.lbl_ramadan_timer.setStyleSheet(
+                "color: #bb9af7; font-weight: bold; font-size: 13px; background: transparent;")
+            self.lbl_ramadan_timer.show()
 
     def bildir(self, name, tip):
         title = "Vakit Hatırlatma" if tip == "uyari" else "Vakit Girdi"
@@ -629,12 +696,12 @@ class NamazHUD(QWidget):
         if not self.ses_aktif: return
 
         if tip == "uyari":
-            self.backend.play_sound("alarm", duration_sec=self.bip_sure)
+            self.audio.play_sound("alarm", duration_sec=self.bip_sure)
         elif tip == "vakit_girdi":
             if self.vakit_girdi_tipi == "ezan":
-                self.backend.play_sound("ezan", is_morning=(name == "İmsak"), is_sun=(name == "Güneş"))
+                self.audio.play_sound("ezan", is_morning=(name == "İmsak"), is_sun=(name == "Güneş"))
             else:
-                self.backend.play_sound("alarm", duration_sec=self.bip_sure)
+                self.audio.play_sound("alarm", duration_sec=self.bip_sure)
 
     def create_autostart_entry(self):
         try:
@@ -668,6 +735,20 @@ class NamazHUD(QWidget):
     def mouseReleaseEvent(self, e):
         self.m_pos = None # Sürükleme bitti
 
+    # --- DÜŞÜK GÜÇ MODU ---
+    # Tepsiye gizlenince çizim tiki durur; sadece bildirim timer'ları kurulu kalır.
+    def hideEvent(self, e):
+        self.timer.stop()
+        super().hideEvent(e)
+
+    def showEvent(self, e):
+        super().showEvent(e)
+        if not self.timer.isActive():
+            # Gizliyken veri / gün değişmiş olabilir: tam yenile, sonra tiki başlat
+            self.fetch_data()
+            self.update_logic()
+            self.timer.start(1000)
+
     def toggle_window(self):
         if self.isVisible():
             self.hide()
@@ -689,11 +770,6 @@ class NamazHUD(QWidget):
             lambda r: self.toggle_window() if r == QSystemTrayIcon.ActivationReason.Trigger else None)
         self.tray.show()
 
-    def clear_layout(self, layout):
-        while layout.count():
-            child = layout.takeAt(0)
-            if child.widget(): child.widget().deleteLater()
-
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
@@ -713,6 +789,8 @@ if __name__ == "__main__":
         sys.exit(0)
 
     window = NamazHUD()
+    # Kapanışta arka plandaki istekler bitmeden QThread'ler yok edilmesin
+    app.aboutToQuit.connect(window.backend.shutdown)
     window.show()
     
     exit_code = app.exec()
@@ -0,0 +1,368 @@
+import os
+import json
+import atexit
+import time
+import sqlite3
+import threading
+
+# =============================================================================
+# VAKİT ÖNBELLEĞİ (SQLite)
+# Her satır bir ilçenin bir gününü tutar: (district_id, tarih) birincil anahtar.
+# Okuma/yazma sadece ilgili satırlara dokunur, açılışta tüm geçmiş okunmaz.
+# =============================================================================
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS vakitler (
+    district_id TEXT NOT NULL,
+    tarih       TEXT NOT NULL,   -- ISO (yyyy-mm-dd), sıralanabilir
+    veri        TEXT NOT NULL,   -- API'nin o güne ait kaydı (JSON)
+    guncelleme  REAL NOT NULL,   -- kayıt zamanı (epoch)
+    PRIMARY KEY (district_id, tarih)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS ilce_erisim (
+    district_id TEXT PRIMARY KEY,
+    son_erisim  REAL NOT NULL    -- en son kullanım zamanı (epoch), LRU için
+);
+
+CREATE TABLE IF NOT EXISTS konum_listeleri (
+    yol         TEXT PRIMARY KEY, -- API yolu: /ulkeler, /sehirler/{id}, /ilceler/{id}
+    veri        TEXT NOT NULL,    -- API yanıtı (JSON liste)
+    guncelleme  REAL NOT NULL     -- son doğrulama zamanı (epoch), TTL için
+);
+
+CREATE TABLE IF NOT EXISTS ilce_konum (
+    district_id TEXT PRIMARY KEY,
+    enlem       REAL NOT NULL,
+    boylam      REAL NOT NULL,
+    saat_dilimi REAL NOT NULL    -- UTC farkı (saat), çevrimdışı hesap için
+);
+"""
+
+
+def to_iso(date_str):
+    """'14.01.2026' -> '2026-01-14'. Hatalı formatta None döner."""
+    try:
+        day, month, year = date_str.split('.')
+        return f"{int(year):04d}-{int(month):02d}-{int(day):02d}"
+    except:
+        return None
+
+
+def index_by_date(data_list):
+    """API'nin gün listesini ISO tarih -> gün kaydı sözlüğüne çevirir."""
+    days = {}
+    for item in data_list:
+        iso_date = to_iso(item.get("MiladiTarihKisa", ""))
+        if iso_date:
+            days[iso_date] = item
+    return days
+
+
+def atomic_write(path, data):
+    """
+    data'yı (bytes) path'e yarım kalmayacak şekilde yazar: geçici dosya + fsync + rename.
+    Yazım ortasında çökme olursa eski dosya olduğu gibi kalır.
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    try:
+        # Yeniden adlandırmanın kendisi de kalıcı olsun (dizin girdisi)
+        dir_fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return  # Windows: dizin açılamaz, os.replace yeterli
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+class TimetableStore:
+    """
+    write_delay > 0 ise yazımlar (write-behind) bellekte biriktirilir ve arka plandaki yazıcı
+    thread'i tarafından write_delay sn sonra tek transaction'da diske aktarılır; çağıran beklemez.
+    Okumalar bekleyen yazımları da görür. write_delay = 0: her yazım hemen diske gider.
+    """
+
+    def __init__(self, db_path, write_delay=0):
+        self.db_path = db_path
+        self._uri = False
+        self._keepalive = None
+        # sqlite3 bağlantıları thread'ler arasında paylaşılamaz, her thread kendi bağlantısını açar
+        self._local = threading.local()
+        try:
+            self._conn().executescript(SCHEMA)
+        except sqlite3.Error:
+            self._recover()
+
+        self.write_delay = write_delay
+        self.after_flush = None  # Gün yazan her aktarımdan sonra çağrılır (saklama politikası için)
+        self.flushes = 0
+        self._pending_days = {}   # (district_id, ISO tarih) -> (gün kaydı, kayıt zamanı)
+        self._pending_touch = {}  # district_id -> son erişim
+        self._pending_lists = {}  # yol -> (liste, kayıt zamanı)
+        self._pending_locs = {}   # district_id -> (enlem, boylam, saat dilimi)
+        self._pending_lock = threading.Lock()
+        self._write_lock = threading.Lock()  # Aynı anda tek aktarım (yazıcı thread / flush / close)
+        self._wake = threading.Event()
+        self._writer_thread = None  # İlk ertelenmiş yazımda başlatılır
+
+    def _recover(self):
+        """
+        Veritabanı açılamadı: bozuk / SQLite olmayan dosya kenara çekilip yenisi açılır.
+        O da olmazsa (salt okunur kurulum dizini) cache bellekte tutulur; uygulama yine açılır.
+        """
+        self._close_local()
+        try:
+            os.replace(self.db_path, self.db_path + ".bozuk")
+            for suffix in ("-wal", "-shm"):
+                if os.path.exists(self.db_path + suffix):
+                    os.remove(self.db_path + suffix)
+            self._conn().executescript(SCHEMA)
+            return
+        except (OSError, sqlite3.Error):
+            self._close_local()
+        # Paylaşımlı bellek veritabanı: tüm thread'lerin bağlantıları aynı veriyi görür
+        self.db_path = f"file:namazvakti_{id(self)}?mode=memory&cache=shared"
+        self._uri = True
+        self._keepalive = sqlite3.connect(self.db_path, uri=True, check_same_thread=False)
+        self._conn().executescript(SCHEMA)
+
+    def _close_local(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5, uri=self._uri)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # --- ERTELENMİŞ YAZIM (WRITE-BEHIND) ---
+    def _queued(self):
+        """Bekleyen yazım eklendikten sonra çağrılır: ertelenmiş modda yazıcıyı uyandırır, değilse hemen yazar."""
+        if self.write_delay > 0:
+            if self._writer_thread is None:
+                with self._write_lock:
+                    if self._writer_thread is None:
+                        self._writer_thread = threading.Thread(target=self._writer, name="cache-writer", daemon=True)
+                        self._writer_thread.start()
+                        atexit.register(self.flush)  # Kapanışta kuyrukta kalan yazılmadan çıkılmasın
+            self._wake.set()
+        else:
+            self.flush()
+
+    def _writer(self):
+        while True:
+            self._wake.wait()
+            # Debounce: bu sürede gelen diğer güncellemeler de aynı aktarıma girer
+            time.sleep(self.write_delay)
+            self._wake.clear()
+            try:
+                self.flush()
+            except sqlite3.Error:
+                self._wake.set()  # Disk kilitli / dolu: kayıtlar kuyrukta kaldı, sonra tekrar denenir
+
+    def pending(self):
+        """Henüz diske aktarılmamış kayıt sayısı."""
+        with self._pending_lock:
+            return (len(self._pending_days) + len(self._pending_touch)
+                    + len(self._pending_lists) + len(self._pending_locs))
+
+    def flush(self):
+        """Bekleyen tüm yazımları tek transaction'da diske aktarır. Yazılan gün sayısını döner."""
+        written = self._write_pending()
+        if written and self.after_flush:
+            self.after_flush()
+        return written
+
+    def _write_pending(self):
+        with self._write_lock:
+            with self._pending_lock:
+                queues = (self._pending_days, self._pending_touch, self._pending_lists, self._pending_locs)
+                batches = [dict(q) for q in queues]
+            if not any(batches):
+                return 0
+            self._write_rows(*batches)
+            # Kayıtlar diske geçene kadar kuyrukta kalır (okumalar görsün); bu arada güncellenenler kalır
+            with self._pending_lock:
+                for queue, batch in zip(queues, batches):
+                    for key, value in batch.items():
+                        if queue.get(key) is value:
+                            del queue[key]
+            self.flushes += 1
+            return len(batches[0])
+
+    def _write_rows(self, days, touch, lists, locs):
+        conn = self._conn()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO vakitler (district_id, tarih, veri, guncelleme) VALUES (?, ?, ?, ?)",
+                [(district_id, iso_date, json.dumps(item, ensure_ascii=False), ts)
+                 for (district_id, iso_date), (item, ts) in days.items()])
+            conn.executemany("INSERT OR REPLACE INTO ilce_erisim (district_id, son_erisim) VALUES (?, ?)",
+                             list(touch.items()))
+            conn.executemany("INSERT OR REPLACE INTO konum_listeleri (yol, veri, guncelleme) VALUES (?, ?, ?)",
+                             [(path, json.dumps(data, ensure_ascii=False), ts) for path, (data, ts) in lists.items()])
+            conn.executemany("INSERT OR REPLACE INTO ilce_konum (district_id, enlem, boylam, saat_dilimi) "
+                             "VALUES (?, ?, ?, ?)", [(d,) + coords for d, coords in locs.items()])
+
+    # --- VAKİTLER ---
+    def load_district(self, district_id):
+        """Bir ilçenin kayıtlı tüm günlerini ISO tarih -> gün kaydı olarak döner."""
+        key = str(district_id)
+        rows = self._conn().execute(
+            "SELECT tarih, veri FROM vakitler WHERE district_id = ?", (key,))
+        days = {tarih: json.loads(veri) for tarih, veri in rows}
+        with self._pending_lock:
+            days.update({iso_date: item for (d, iso_date), (item, _) in self._pending_days.items() if d == key})
+        return days
+
+    def last_update(self, district_id):
+        """İlçenin en son yazılan gününün kayıt zamanı (epoch), hiç yoksa 0."""
+        key = str(district_id)
+        with self._pending_lock:
+            pending = [ts for (d, _), (_, ts) in self._pending_days.items() if d == key]
+        if pending:
+            return max(pending)
+        row = self._conn().execute(
+            "SELECT MAX(guncelleme) FROM vakitler WHERE district_id = ?", (key,)).fetchone()
+        return row[0] or 0
+
+    def put_days(self, district_id, days):
+        """ISO tarih -> gün kaydı sözlüğünü ekler / günceller (upsert). Yazılan satır sayısını döner."""
+        return self.put_many({district_id: days})
+
+    def put_many(self, district_days):
+        """{district_id: {ISO tarih: gün kaydı}} - tüm ilçeleri tek transaction'da yazar."""
+        now = time.time()
+        rows = {(str(district_id), iso_date): (item, now)
+                for district_id, days in district_days.items()
+                for iso_date, item in days.items()}
+        if not rows:
+            return 0
+        with self._pending_lock:
+            self._pending_days.update(rows)
+        self._queued()
+        return len(rows)
+
+    # --- KONUM HİYERARŞİSİ (ÜLKE / ŞEHİR / İLÇE) ---
+    def get_list(self, path):
+        """Kayıtlı konum listesi: (liste, son doğrulama epoch) veya None."""
+        with self._pending_lock:
+            pending = self._pending_lists.get(path)
+        if pending:
+            return pending
+        row = self._conn().execute(
+            "SELECT veri, guncelleme FROM konum_listeleri WHERE yol = ?", (path,)).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def put_list(self, path, data):
+        with self._pending_lock:
+            self._pending_lists[path] = (data, time.time())
+        self._queued()
+
+    def iter_lists(self, prefix):
+        """Yolu prefix ile başlayan kayıtlı listeler: [(yol, liste), ...]"""
+        self._write_pending()
+        rows = self._conn().execute(
+            "SELECT yol, veri FROM konum_listeleri WHERE yol LIKE ? || '%'", (prefix,)).fetchall()
+        return [(path, json.loads(veri)) for path, veri in rows]
+
+    def lists_signature(self):
+        """Konum listelerinin durumu ('sayı:son güncelleme'); arama indeksinin tazeliği için."""
+        self._write_pending()
+        count, last = self._conn().execute(
+            "SELECT COUNT(*), COALESCE(MAX(guncelleme), 0) FROM konum_listeleri").fetchone()
+        return f"{count}:{last:.3f}"
+
+    # --- KONUM (ÇEVRİMDIŞI HESAP) ---
+    def set_location(self, district_id, lat, lon, tz_hours):
+        with self._pending_lock:
+            self._pending_locs[str(district_id)] = (lat, lon, tz_hours)
+        self._queued()
+
+    def get_location(self, district_id):
+        """(enlem, boylam, saat dilimi) veya None."""
+        with self._pending_lock:
+            pending = self._pending_locs.get(str(district_id))
+        if pending:
+            return pending
+        return self._conn().execute(
+            "SELECT enlem, boylam, saat_dilimi FROM ilce_konum WHERE district_id = ?",
+            (str(district_id),)).fetchone()
+
+    # --- SAKLAMA POLİTİKASI ---
+    def touch_district(self, district_id):
+        """İlçenin son kullanım zamanını günceller (disk tarafı LRU için)."""
+        self.touch_districts([district_id])
+
+    def touch_districts(self, district_ids):
+        now = time.time()
+        with self._pending_lock:
+            self._pending_touch.update((str(d), now) for d in district_ids)
+        self._queued()
+
+    def purge_before(self, iso_date):
+        """Verilen tarihten eski günleri siler. Silinen satır sayısını döner."""
+        self._write_pending()
+        conn = self._conn()
+        with conn:
+            cur = conn.execute("DELETE FROM vakitler WHERE tarih < ?", (iso_date,))
+        return cur.rowcount
+
+    def trim_districts(self, max_districts):
+        """En son kullanılan max_districts ilçe dışındakileri siler. Silinen ilçeleri döner."""
+        self._write_pending()
+        conn = self._conn()
+        known = [row[0] for row in conn.execute("SELECT DISTINCT district_id FROM vakitler")]
+        if len(known) <= max_districts:
+            return []
+        recency = dict(conn.execute("SELECT district_id, son_erisim FROM ilce_erisim"))
+        known.sort(key=lambda d: recency.get(d, 0), reverse=True)
+        evicted = known[max_districts:]
+        with conn:
+            conn.executemany("DELETE FROM vakitler WHERE district_id = ?", [(d,) for d in evicted])
+            conn.executemany("DELETE FROM ilce_erisim WHERE district_id = ?", [(d,) for d in evicted])
+        return evicted
+
+    def migrate_json(self, json_path):
+        """
+        Eski prayer_cache.json dosyasını ('times_{ilce}_{ay}_{yil}' -> liste) bir kez içeri alır.
+        Başarılı olursa dosya '.migrated' uzantısıyla kenara çekilir.
+        """
+        if not os.path.exists(json_path):
+            return 0
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                old_cache = json.load(f)
+        except:
+            old_cache = {}
+
+        count = 0
+        for key, data_list in old_cache.items():
+            parts = key.split('_')
+            if len(parts) != 4 or parts[0] != "times" or not isinstance(data_list, list):
+                continue
+            count += self.put_days(parts[1], index_by_date(data_list))
+
+        try:
+            os.replace(json_path, json_path + ".migrated")
+        except OSError:
+            pass
+        return count
+
+    def close(self):
+        self.flush()
+        self._close_local()
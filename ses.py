@@ -0,0 +1,58 @@
+import os
+from PyQt6.QtCore import QUrl, QTimer, QObject
+from yollar import SOUND_PATH_BIP, SOUND_PATH_EZAN, SOUND_PATH_SABAHEZAN
+
+# =============================================================================
+# SES ALTYAPISI
+# QtMultimedia (ve arkasındaki GStreamer / PulseAudio yığını) ağırdır; ilk
+# play_sound çağrısına kadar yüklenmez. Ses kapalıysa hiç yüklenmez.
+# =============================================================================
+
+
+class AudioPlayer(QObject):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.player = None
+        self.audio_output = None
+        self.stop_btn_ref = None
+
+    def _ensure_player(self):
+        if self.player is None:
+            from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput
+            self.player = QMediaPlayer()
+            self.audio_output = QAudioOutput()
+            self.player.setAudioOutput(self.audio_output)
+            self.audio_output.setVolume(1.0)
+        return self.player
+
+    def unload(self):
+        """Medya oynatıcıyı bırakır (ses ayarlardan kapatıldığında)."""
+        if self.player is not None:
+            self.stop_sound()
+            self.player.deleteLater()
+            self.audio_output.deleteLater()
+            self.player = None
+            self.audio_output = None
+
+    # --- SES ÇALMA ---
+    def play_sound(self, sound_type, duration_sec=0, is_morning=False, is_sun=False):
+        file_path = SOUND_PATH_BIP
+        infinite = True
+
+        if sound_type == "ezan" and not is_sun:
+            file_path = SOUND_PATH_SABAHEZAN if is_morning else SOUND_PATH_EZAN
+            infinite = False
+
+        if os.path.exists(file_path):
+            player = self._ensure_player()
+            player.stop()
+            player.setSource(QUrl.fromLocalFile(os.path.abspath(file_path)))
+            player.setLoops(player.Loops.Infinite if infinite else 1)
+            if sound_type != "ezan" and duration_sec > 0:
+                QTimer.singleShot(duration_sec * 1000, self.stop_sound)
+            player.play()
+            if self.stop_btn_ref: self.stop_btn_ref.show()
+
+    def stop_sound(self):
+        if self.player: self.player.stop()
+        if self.stop_btn_ref: self.stop_btn_ref.hide()
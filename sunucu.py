@@ -0,0 +1,257 @@
+"""
+Namaz Vakti HTTP servisi (GUI'siz). Tek süreç, NamazBackend'in cache'ini paylaşır;
+lobi ekranları / intranet sayfaları API'ye ayrı ayrı gitmez.
+
+    python sunucu.py --port 8080 [--host 0.0.0.0] [--warm 9541,9206] [--max-districts 64]
+
+Uç noktalar (JSON):
+    GET /times/{ilçe}/{tarih}   tarih: yyyy-mm-dd, dd.mm.yyyy veya "today"
+    GET /next/{ilçe}            sıradaki vakit ve kalan süre
+    GET /stats                  cache ve sunucu sayaçları
+Yanıtlar ETag taşır; If-None-Match eşleşirse 304 döner. API penceresi dışındaki tarihler
+sadece cache'ten / çevrimdışı hesaptan cevaplanır (yoksa 404); hatalar kısa süre hatırlanır.
+"""
+import sys
+import json
+import hashlib
+import argparse
+import time
+import datetime
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from backend import NamazBackend, PREFETCH_MIN_DAYS, API_WINDOW_DAYS
+from cli import get_day, day_info, next_prayer
+
+RESPONSE_CACHE_MAX = 4096       # Hazır (serileştirilmiş) /times yanıtı sayısı
+TIMES_MAX_AGE = 3600            # Diyanet verisi: gün içinde değişmez
+COMPUTED_MAX_AGE = 60           # Çevrimdışı hesaplanan / yenilenmekte olan eski veri: kısa ömürlü
+NEXT_MAX_AGE = 10               # remaining_sec birkaç saniye eskiyebilir
+REFRESH_INTERVAL_SEC = 30 * 60  # Sunulan ilçelerin ileri günleri kontrol aralığı
+ERROR_TTL_SEC = 60              # 404 / 502 sonucu bu kadar süre tekrar denenmez (API'yi korur)
+ERROR_CACHE_MAX = 4096
+
+
+def parse_date(text):
+    """'today', '2026-01-14' veya '14.01.2026' -> datetime.date; hatalıysa None."""
+    if text == "today":
+        return datetime.date.today()
+    for fmt in ("%Y-%m-%d", "%d.%m.%Y"):
+        try:
+            return datetime.datetime.strptime(text, fmt).date()
+        except ValueError:
+            pass
+    return None
+
+
+class TimesService:
+    """Backend üzerinde, hazır JSON yanıtlarını bellekte tutan ince katman (thread-safe)."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._responses = {}   # (ilçe, ISO tarih) -> (etag, body)
+        self._errors = {}      # (ilçe, ISO tarih / "next") -> (son geçerlilik, istisna)
+        self._lock = threading.Lock()
+        self.districts = set()  # Başarıyla sunulan ilçeler (arka plan yenileme için)
+        self.stats = {"requests": 0, "not_modified": 0, "response_hits": 0, "errors": 0, "error_hits": 0}
+
+    def count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def times(self, district_id, date):
+        """(etag, body, geçici mi). Veri yoksa LookupError, API hatasında RuntimeError."""
+        key = (district_id, date.isoformat())
+        with self._lock:
+            cached = self._responses.get(key)
+            if cached:
+                self.stats["response_hits"] += 1
+                return cached[0], cached[1], False
+        self._raise_recent_error(key)
+
+        try:
+            day = self._lookup(district_id, date)
+        except (LookupError, RuntimeError) as e:
+            self._remember_error(key, e)
+            raise
+        etag, body = make_body(day)
+        provisional = day["computed"] or day["stale"]
+        with self._lock:
+            self.districts.add(district_id)
+            if not provisional:
+                # Hesaplanan / eski veri saklanmaz: API dönünce (yenilenmiş) Diyanet verisi sunulmalı
+                if len(self._responses) >= RESPONSE_CACHE_MAX:
+                    self._responses.clear()
+                self._responses[key] = (etag, body)
+        return etag, body, provisional
+
+    def _lookup(self, district_id, date):
+        """API penceresindeki tarihler için get_day; dışındakiler ağa çıkmadan cache / hesaptan."""
+        today = datetime.date.today()
+        if date.isoformat() >= self.backend.retention_cutoff() and \
+                date < today + datetime.timedelta(days=API_WINDOW_DAYS):
+            return get_day(self.backend, district_id, date)
+        date_str = date.strftime("%d.%m.%Y")
+        day = self.backend.lookup_cached(district_id, date_str) or self.backend.compute_offline(district_id, date_str)
+        if day is None:
+            raise LookupError("Seçilen tarih için veri bulunamadı.")
+        return day_info(day)
+
+    def next(self, district_id):
+        key = (district_id, "next")
+        self._raise_recent_error(key)
+        try:
+            info = next_prayer(self.backend, district_id)
+        except (LookupError, RuntimeError) as e:
+            self._remember_error(key, e)
+            raise
+        with self._lock:
+            self.districts.add(district_id)
+        return make_body(info)
+
+    def _raise_recent_error(self, key):
+        with self._lock:
+            error = self._errors.get(key)
+            if error and error[0] > time.monotonic():
+                self.stats["error_hits"] += 1
+                raise error[1]
+
+    def _remember_error(self, key, error):
+        with self._lock:
+            if len(self._errors) >= ERROR_CACHE_MAX:
+                now = time.monotonic()
+                self._errors = {k: v for k, v in self._errors.items() if v[0] > now}
+                if len(self._errors) >= ERROR_CACHE_MAX:
+                    self._errors.clear()
+            self._errors[key] = (time.monotonic() + ERROR_TTL_SEC, error)
+
+    def refresh_loop(self, stop_event):
+        """Sunulan ilçelerden ufku kısalanları toplu ve hız sınırıyla yeniler."""
+        while not stop_event.wait(REFRESH_INTERVAL_SEC):
+            with self._lock:
+                districts = list(self.districts)
+            stale = [d for d in districts if self.backend.cached_horizon(d) < PREFETCH_MIN_DAYS]
+            if stale:
+                self.backend.fetch_many(stale)
+
+    def snapshot(self):
+        with self._lock:
+            stats = dict(self.stats, responses_cached=len(self._responses), districts=len(self.districts))
+        stats["backend"] = self.backend.get_cache_stats()
+        stats["circuit"] = self.backend.get_circuit_state()
+        return stats
+
+
+def make_body(obj):
+    body = json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return '"' + hashlib.sha1(body).hexdigest()[:20] + '"', body
+
+
+class TimesHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive: istemciler bağlantıyı tekrar kullanır
+    disable_nagle_algorithm = True  # Başlık ve gövde ayrı yazılır; Nagle + gecikmeli ACK ~40 ms ekler
+    server_version = "NamazVakti"
+    service = None  # serve() tarafından atanır
+
+    def do_GET(self):
+        service = self.service
+        service.count("requests")
+        parts = [p for p in self.path.split("?", 1)[0].split("/") if p]
+        # İlçe ID'si Diyanet'in sayısal kimliğidir; başka her şey API'ye ve cache'e gitmeden reddedilir
+        if len(parts) >= 2 and parts[0] in ("times", "next") and not (parts[1].isascii() and parts[1].isdigit()):
+            return self.send_json(400, {"error": "Geçersiz ilçe ID"})
+        try:
+            if len(parts) == 3 and parts[0] == "times":
+                date = parse_date(parts[2])
+                if date is None:
+                    return self.send_json(400, {"error": "Tarih formatı hatası (yyyy-mm-dd)"})
+                etag, body, provisional = service.times(parts[1], date)
+                return self.send_body(etag, body, COMPUTED_MAX_AGE if provisional else TIMES_MAX_AGE)
+            if len(parts) == 2 and parts[0] == "next":
+                etag, body = service.next(parts[1])
+                return self.send_body(etag, body, NEXT_MAX_AGE)
+            if parts == ["stats"]:
+                return self.send_json(200, service.snapshot(), cache_control="no-store")
+            return self.send_json(404, {"error": "Bulunamadı"})
+        except LookupError as e:
+            service.count("errors")
+            return self.send_json(404, {"error": str(e)})
+        except RuntimeError as e:
+            service.count("errors")
+            return self.send_json(502, {"error": str(e)})
+
+    def send_body(self, etag, body, max_age):
+        if etag in self.headers.get("If-None-Match", ""):
+            self.service.count("not_modified")
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", f"public, max-age={max_age}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", f"public, max-age={max_age}")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, status, obj, cache_control="no-cache"):
+        body = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Cache-Control", cache_control)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, fmt, *args):
+        pass  # Her istek için satır basmak binlerce istek/sn'de darboğaz olur
+
+
+def make_server(host, port, backend=None):
+    """Hazır (henüz dinlemeyen) sunucu ve servis nesnesi."""
+    service = TimesService(backend or NamazBackend())
+    handler = type("Handler", (TimesHandler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server, service
+
+
+def serve(host, port, warm=(), backend=None, max_districts=None):
+    server, service = make_server(host, port, backend)
+    # Sunulan / ısıtılan ilçeler saklama politikası yüzünden silinip tekrar çekilmesin
+    limit = max(max_districts or service.backend.max_districts, len(warm))
+    if limit != service.backend.max_districts:
+        service.backend.set_cache_policy(max_districts=limit)
+    if warm:
+        service.districts.update(warm)
+        service.backend.fetch_many(warm)
+    stop_event = threading.Event()
+    threading.Thread(target=service.refresh_loop, args=(stop_event,), daemon=True).start()
+    print(f"Dinleniyor: http://{server.server_address[0]}:{server.server_address[1]}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_event.set()
+        server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="namazvakti-sunucu", description="Namaz vakitleri HTTP servisi")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--warm", help="Açılışta cache'i ısıtılacak ilçeler (virgülle)")
+    parser.add_argument("--max-districts", type=int,
+                        help="Bellekte ve diskte tutulacak en fazla ilçe (varsayılan: 16 ve --warm sayısından büyüğü)")
+    args = parser.parse_args(argv)
+    warm = [d.strip() for d in (args.warm or "").split(",") if d.strip()]
+    serve(args.host, args.port, warm, max_districts=args.max_districts)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,28 +1,17 @@
-import sys
-import os
-import json
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                              QPushButton, QComboBox, QFrame, QMessageBox,
-                             QSlider, QCheckBox, QSpinBox)
+                             QSlider, QCheckBox, QSpinBox, QLineEdit, QListWidget,
+                             QListWidgetItem)
 from PyQt6.QtCore import Qt
 
 # Backend referansı için import etmeyeceğiz, parametre olarak alacağız veya main'den yöneteceğiz.
 # Ancak LocationDialog içinde basit request işlemleri için backend metodlarına ihtiyacımız var.
 # Döngüsel import olmaması için main'den backend nesnesini parametre olarak alacağız.
 
-def resource_path(relative_path):
-    try:
-        base_path = sys._MEIPASS
-    except Exception:
-        base_path = os.path.dirname(os.path.abspath(__file__))
-    return os.path.join(base_path, relative_path)
-
-# Yollar
-LOGO_PATH = resource_path(os.path.join("assets", "logo.png"))
-SOUND_PATH_BIP = resource_path(os.path.join("assets", "bip.ogg"))
-SOUND_PATH_EZAN = resource_path(os.path.join("assets", "ezan.ogg"))
-SOUND_PATH_SABAHEZAN = resource_path(os.path.join("assets", "sabahezan.ogg"))
-CACHE_PATH = resource_path("prayer_cache.json")
+# Yollar widget'sız modülde tutulur (backend ve komut satırı aracı Qt widget'larını yüklemesin)
+from yollar import (resource_path, LOGO_PATH, SOUND_PATH_BIP, SOUND_PATH_EZAN,
+                    SOUND_PATH_SABAHEZAN, CACHE_PATH)
+from astronomi import city_coordinates
 
 
 # --- AYARLAR DİYALOĞU ---
@@ -125,7 +114,7 @@ class LocationDialog(QDialog):
         self.settings = settings
         self.backend = backend # Backend nesnesini kullanacağız
         self.setWindowTitle("Konum Ayarları")
-        self.setFixedSize(320, 300)
+        self.setFixedSize(320, 440)
         self.setStyleSheet("""
             QDialog { background-color: #1a1b26; color: #c0caf5; }
             QLabel { color: #c0caf5; font-weight: bold; }
@@ -134,6 +123,11 @@ class LocationDialog(QDialog):
                 padding: 5px; color: white; border-radius: 4px;
             }
             QComboBox::drop-down { border:none; }
+            QLineEdit, QListWidget {
+                background: #24283b; border: 1px solid #414868;
+                padding: 5px; color: white; border-radius: 4px;
+            }
+            QListWidget::item:selected { background: #414868; }
             QPushButton { padding: 8px; border-radius: 4px; font-weight:bold; }
         """)
 
@@ -143,6 +137,19 @@ class LocationDialog(QDialog):
 
         layout.addWidget(QLabel("Konum Seçimi (Diyanet Uyumlu)"))
 
+        # Hızlı arama: yazarken tüm ilçelerde (Türkçe harf / büyük-küçük harf duyarsız)
+        self.search_index = None
+        self.txt_search = QLineEdit()
+        self.txt_search.setPlaceholderText("İlçe veya şehir ara...")
+        self.txt_search.textChanged.connect(self.update_search)
+        self.txt_search.returnPressed.connect(self.save_and_close)
+        layout.addWidget(self.txt_search)
+        self.list_results = QListWidget()
+        self.list_results.setFixedHeight(110)
+        self.list_results.itemActivated.connect(lambda item: self.save_and_close())
+        self.list_results.hide()
+        layout.addWidget(self.list_results)
+
         # Ülke
         layout.addWidget(QLabel("Ülke:"))
         self.combo_country = QComboBox()
@@ -174,92 +181,137 @@ class LocationDialog(QDialog):
         btn_layout.addWidget(btn_cancel)
         layout.addLayout(btn_layout)
 
+        # Listeler backend'den sinyal ile gelir (cache'ten anında, yoksa arka planda API'den)
+        self._paths = {"country": "/ulkeler", "city": None, "district": None}
+        if self.backend:
+            self.backend.locations_ready.connect(self.on_locations_ready)
+            self.backend.location_index_ready.connect(self.on_index_ready)
+
         # Başlangıç verilerini yükle
         self.load_initial_data()
+        if self.backend:
+            self.backend.request_location_index()
+
+    def done(self, result):
+        if self.backend:
+            self.backend.locations_ready.disconnect(self.on_locations_ready)
+            self.backend.location_index_ready.disconnect(self.on_index_ready)
+        super().done(result)
+
+    # --- ARAMA ---
+    def on_index_ready(self, index):
+        self.search_index = index
+        self.txt_search.setPlaceholderText(f"İlçe veya şehir ara... ({len(index)} ilçe)")
+        if self.txt_search.text():
+            self.update_search(self.txt_search.text())
+
+    def update_search(self, text):
+        self.list_results.clear()
+        if not text.strip() or not self.search_index:
+            self.list_results.hide()
+            return
+        for entry in self.search_index.search(text):
+            district_id, district, city, country = entry
+            label = district if district == city else f"{district} / {city}"
+            item = QListWidgetItem(label if country == "TÜRKİYE" else f"{label} ({country})")
+            item.setData(Qt.ItemDataRole.UserRole, entry)
+            self.list_results.addItem(item)
+        self.list_results.setCurrentRow(0)
+        self.list_results.show()
 
     def load_initial_data(self):
         """Ülkeleri yükler ve kayıtlı seçimi getirir."""
         if not self.backend: return
-        
-        # Ülkeleri Çek
         self.combo_country.addItem("Yükleniyor...", None)
-        countries, error = self.backend.get_countries()
-        
-        self.combo_country.clear()
-        if error:
-            self.combo_country.addItem(f"Hata: {error}")
-            return
-
-        # Ülkeleri sırala (Türkiye en başa)
-        turkey = None
-        others = []
-        for c in countries:
-            if c['UlkeAdi'] == "TÜRKİYE":
-                turkey = c
-            else:
-                others.append(c)
-        
-        # Türkçe karakter sıralaması için basit key
-        others.sort(key=lambda x: x['UlkeAdi'])
-        
-        if turkey: self.combo_country.addItem(turkey['UlkeAdi'], turkey['UlkeID'])
-        for c in others:
-            self.combo_country.addItem(c['UlkeAdi'], c['UlkeID'])
-
-        # Önceden kayıtlı veri varsa seçmeye çalış (Sadece ülke bazlı değil, genel mantık)
-        # Varsayılan Türkiye seçili gelsin (Index 0)
-        self.combo_country.setCurrentIndex(0) 
+        self.backend.request_location_list(self._paths["country"])
 
     def load_cities(self):
         """Seçilen ülkeye göre şehirleri yükler."""
         country_id = self.combo_country.currentData()
         if not country_id: return
-
-        self.combo_city.clear()
-        self.combo_city.addItem("Yükleniyor...", None)
-        
-        cities, error = self.backend.get_cities(country_id)
-        self.combo_city.clear()
-        
-        if error:
-            self.combo_city.addItem("Hata", None)
-            return
-
-        for city in cities:
-            self.combo_city.addItem(city['SehirAdi'], city['SehirID'])
-
-        # Kayıtlı şehir varsa seç (Opsiyonel geliştirilebilir)
+        self._request("city", self.combo_city, f"/sehirler/{country_id}")
 
     def load_districts(self):
         """Seçilen şehre göre ilçeleri yükler."""
         city_id = self.combo_city.currentData()
         if not city_id: return
-
-        self.combo_district.clear()
-        self.combo_district.addItem("Yükleniyor...", None)
-        
-        districts, error = self.backend.get_districts(city_id)
-        self.combo_district.clear()
-        
+        self._request("district", self.combo_district, f"/ilceler/{city_id}")
+
+    def _request(self, level, combo, path):
+        self._paths[level] = path
+        combo.blockSignals(True)
+        combo.clear()
+        combo.addItem("Yükleniyor...", None)
+        combo.blockSignals(False)
+        self.backend.request_location_list(path)
+
+    def on_locations_ready(self, path, items, error):
+        if path == self._paths["country"]:
+            if self._fill(self.combo_country, items, error, "UlkeAdi", "UlkeID",
+                          self.settings.value("country_name", "TÜRKİYE")):
+                self.load_cities()
+        elif path == self._paths["city"]:
+            if self._fill(self.combo_city, items, error, "SehirAdi", "SehirID",
+                          self.settings.value("city_name", "")):
+                self.load_districts()
+        elif path == self._paths["district"]:
+            self._fill(self.combo_district, items, error, "IlceAdi", "IlceID",
+                       None, self.settings.value("district_id"))
+
+    def _fill(self, combo, items, error, name_key, id_key, saved_name=None, saved_id=None):
+        """
+        Combo'yu doldurur; mevcut seçim (yoksa kayıtlı konum) korunur. Arka plan
+        yenilemesi aynı seçimi bulursa alt combo'lar tekrar yüklenmez.
+        Seçim değiştiyse True döner.
+        """
+        previous = combo.currentData()
+        combo.blockSignals(True)
+        combo.clear()
         if error:
-            self.combo_district.addItem("Hata", None)
-            return
-
-        for dist in districts:
-            self.combo_district.addItem(dist['IlceAdi'], dist['IlceID'])
+            combo.addItem(f"Hata: {error}", None)
+            combo.blockSignals(False)
+            return False
+
+        items = list(items)
+        if id_key == "UlkeID":
+            # Ülkeleri sırala (Türkiye en başa)
+            items.sort(key=lambda x: (x['UlkeAdi'] != "TÜRKİYE", x['UlkeAdi']))
+        for item in items:
+            combo.addItem(item[name_key], item[id_key])
+
+        index = combo.findData(previous) if previous is not None else -1
+        if index < 0 and saved_id is not None:
+            index = combo.findData(saved_id)
+        if index < 0 and saved_name:
+            index = combo.findText(saved_name)
+        combo.setCurrentIndex(max(0, index))
+        combo.blockSignals(False)
+        return combo.currentData() != previous
 
     def save_and_close(self):
-        district_id = self.combo_district.currentData()
-        district_name = self.combo_district.currentText()
-        city_name = self.combo_city.currentText()
-        country_name = self.combo_country.currentText()
+        item = self.list_results.currentItem() if not self.list_results.isHidden() else None
+        if item:
+            # Arama sonucundan seçim
+            district_id, district_name, city_name, country_name = item.data(Qt.ItemDataRole.UserRole)
+        else:
+            district_id = self.combo_district.currentData()
+            district_name = self.combo_district.currentText()
+            city_name = self.combo_city.currentText()
+            country_name = self.combo_country.currentText()
 
         if district_id:
             self.settings.setValue("district_id", district_id)
             self.settings.setValue("district_name", district_name)
             self.settings.setValue("city_name", city_name)
             self.settings.setValue("country_name", country_name)
-            # Eski manuel koordinat verilerini temizleyebiliriz veya bırakabiliriz
+            # Koordinat: API'ye ulaşılamazsa vakitler bundan hesaplanır (il merkezi)
+            coords = city_coordinates(city_name)
+            if coords:
+                self.settings.setValue("latitude", coords[0])
+                self.settings.setValue("longitude", coords[1])
+            else:
+                self.settings.remove("latitude")
+                self.settings.remove("longitude")
             self.accept()
         else:
             QMessageBox.warning(self, "Uyarı", "Lütfen geçerli bir ilçe seçiniz.")
\ No newline at end of file
@@ -0,0 +1,138 @@
+import datetime
+from bisect import bisect_right
+
+VAKIT_ISIMLERI = ("İmsak", "Güneş", "Öğle", "İkindi", "Akşam", "Yatsı")
+API_ANAHTARLARI = ("Imsak", "Gunes", "Ogle", "Ikindi", "Aksam", "Yatsi")  # Emushaf /vakitler alanları
+
+_LABELS = tuple(f"{m // 60:02d}:{m % 60:02d}" for m in range(24 * 60))  # dakika -> 'HH:MM'
+
+
+def parse_minutes(t_str):
+    """'06:50' -> 410. Hatalı formatta None."""
+    try:
+        hour, minute = t_str.split(':')
+        value = int(hour) * 60 + int(minute)
+    except:
+        return None
+    return value if 0 <= value < 24 * 60 else None
+
+
+# =============================================================================
+# GÜNÜN VAKİTLERİ (BACKEND -> ARAYÜZ)
+# Cache'teki her gün için bir kez kurulur ve tekrar tekrar döndürülür; arayüz
+# sözlük anahtarı aramaz, 'HH:MM' metinlerini yeniden parse etmez.
+# =============================================================================
+
+
+class PrayerDay:
+    """Bir günün vakitleri (gece yarısından dakika + 'HH:MM') ve Hicri tarihi (değişmez)."""
+    __slots__ = ("date", "minutes", "labels", "hijri_day", "hijri_month", "hijri_year", "hijri_month_name",
+                 "computed", "stale")
+
+    def __init__(self, date, minutes, hijri=(0, 0, 0), hijri_month_name="", computed=False, stale=False):
+        """
+        date: datetime.date, minutes: 6 vakit (İmsak..Yatsı) gece yarısından dakika,
+        hijri: (gün, ay, yıl) - bilinmiyorsa (0, 0, 0).
+        computed: API yerine koordinattan hesaplandı, stale: eski cache verisi (arka planda yenileniyor).
+        """
+        minutes = tuple(minutes)
+        values = (date, minutes, tuple(_LABELS[m] for m in minutes)) + tuple(hijri) + (
+            hijri_month_name, computed, stale)
+        for name, value in zip(self.__slots__, values):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("PrayerDay değiştirilemez")
+
+    @classmethod
+    def from_api(cls, item):
+        """Emushaf /vakitler gün kaydından (astronomi.compute_day da aynı biçimde). Hatalıysa None."""
+        minutes = [parse_minutes(item.get(key, "")) for key in API_ANAHTARLARI]
+        try:
+            day, month, year = item.get("MiladiTarihKisa", "").split('.')
+            date = datetime.date(int(year), int(month), int(day))
+        except:
+            return None
+        if None in minutes:
+            return None
+        try:
+            hijri = tuple(int(p) for p in item["HicriTarihKisa"].split('.'))
+            month_name = " ".join(item.get("HicriTarihUzun", "").split()[1:-1])
+            if len(hijri) != 3:
+                raise ValueError
+        except:
+            hijri, month_name = (0, 0, 0), ""
+        return cls(date, minutes, hijri, month_name, computed=bool(item.get("Hesaplanan")))
+
+    def as_stale(self):
+        """Aynı gün, stale işaretli kopya."""
+        return PrayerDay(self.date, self.minutes, (self.hijri_day, self.hijri_month, self.hijri_year),
+                         self.hijri_month_name, self.computed, True)
+
+    @property
+    def vakitler(self):
+        """[("İmsak", "06:51"), ...] (gün içi sıralı)"""
+        return list(zip(VAKIT_ISIMLERI, self.labels))
+
+    @property
+    def imsak(self):
+        return self.labels[0]
+
+    @property
+    def aksam(self):
+        return self.labels[4]
+
+    @property
+    def hijri_text(self):
+        """'25 Recep 1447'; Hicri tarih bilinmiyorsa boş."""
+        if not self.hijri_day:
+            return ""
+        return f"{self.hijri_day} {self.hijri_month_name or self.hijri_month} {self.hijri_year}"
+
+    def _key(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other):
+        return isinstance(other, PrayerDay) and self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        return f"PrayerDay({self.date.isoformat()}, {' '.join(self.labels)})"
+
+
+# =============================================================================
+# GÜNLÜK VAKİT ÇİZELGESİ
+# Gün başına bir kez (fetch_data sonrası) kurulur; saniyelik döngü sadece
+# tamsayı karşılaştırma ve bisect yapar, string parse etmez.
+# =============================================================================
+
+
+class PrayerSchedule:
+    """Bir günün vakitleri: isimler, 'HH:MM' metinleri ve sıralı epoch saniyeleri (değişmez)."""
+    __slots__ = ("date", "names", "labels", "epochs")
+
+    def __init__(self, date, vakitler, epochs):
+        """date: datetime.date, vakitler: [("İmsak", "06:51"), ...], epochs: yerel vakitlerin epoch'u (sıralı)"""
+        object.__setattr__(self, "date", date)
+        object.__setattr__(self, "names", tuple(name for name, _ in vakitler))
+        object.__setattr__(self, "labels", tuple(t_str for _, t_str in vakitler))
+        object.__setattr__(self, "epochs", tuple(epochs))
+
+    @classmethod
+    def for_day(cls, day):
+        """PrayerDay'den (dakikalar hazır, metin parse edilmez). Yerel saat (DST dahil) -> epoch."""
+        midnight = datetime.datetime.combine(day.date, datetime.time())
+        epochs = [int((midnight + datetime.timedelta(minutes=m)).timestamp()) for m in day.minutes]
+        return cls(day.date, day.vakitler, epochs)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("PrayerSchedule değiştirilemez")
+
+    def __len__(self):
+        return len(self.epochs)
+
+    def next_index(self, now_ts):
+        """now_ts'den sonraki ilk vaktin indeksi. Yatsı da geçtiyse len(self) döner."""
+        return bisect_right(self.epochs, now_ts)
@@ -0,0 +1,20 @@
+import sys
+import os
+
+# Dosya yolları (PyQt6 widget'larına bağımlı olmadan: backend ve komut satırı aracı da kullanır)
+
+def resource_path(relative_path):
+    try:
+        base_path = sys._MEIPASS
+    except Exception:
+        base_path = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base_path, relative_path)
+
+# Yollar
+LOGO_PATH = resource_path(os.path.join("assets", "logo.png"))
+SOUND_PATH_BIP = resource_path(os.path.join("assets", "bip.ogg"))
+SOUND_PATH_EZAN = resource_path(os.path.join("assets", "ezan.ogg"))
+SOUND_PATH_SABAHEZAN = resource_path(os.path.join("assets", "sabahezan.ogg"))
+CACHE_PATH = resource_path("prayer_cache.json")  # Eski JSON cache (sadece taşıma için okunur)
+CACHE_DB_PATH = resource_path("prayer_cache.db")
+LOCATION_INDEX_PATH = resource_path("location_index.json")  # İlçe arama indeksi (arama.py)